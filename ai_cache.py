@@ -0,0 +1,133 @@
+"""
+Response cache for Smart Study Assistant
+Stores Gemini results on disk so repeated requests skip the API
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import config
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def make_key(fn, text, *params):
+    """Build a SHA-256 cache key from function name, parameters and input text"""
+    parts = [fn] + [str(p) for p in params] + [text]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+class Cache:
+    """Small key/value store backed by SQLite with per-entry expiry
+
+    The most recently used entries are also held in memory, so repeating
+    an action on the same note skips the database read.
+    """
+
+    def __init__(
+        self, path=config.CACHE_FILE, memory_entries=config.CACHE_MEMORY_ENTRIES
+    ):
+        self.path = path
+        self.memory_entries = memory_entries
+        self._lock = threading.Lock()
+        self._conn = None
+        self._memory = OrderedDict()  # key -> (value, expires)
+
+    def _remember(self, key, value, expires):
+        """Keep an entry in the in-memory LRU (caller holds the lock)"""
+        self._memory[key] = (value, expires)
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing/expired"""
+        try:
+            with self._lock:
+                row = self._memory.get(key)
+                if row is not None:
+                    self._memory.move_to_end(key)
+                else:
+                    row = self._connect().execute(
+                        "SELECT value, expires FROM cache WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        self._remember(key, *row)
+        except sqlite3.Error as e:
+            logger.warning("Cache read failed: %s", e)
+            return None
+
+        if row is None:
+            return None
+        value, expires = row
+        if expires < time.time():
+            self.delete(key)
+            return None
+        return value
+
+    def set(self, key, value, ttl=config.CACHE_TTL):
+        """Store value under key for ttl seconds"""
+        expires = time.time() + ttl
+        try:
+            with self._lock:
+                self._remember(key, value, expires)
+                conn = self._connect()
+                conn.execute(
+                    "INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+                    "expires = excluded.expires",
+                    (key, value, expires),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("Cache write failed: %s", e)
+
+    def delete(self, key):
+        """Remove a single entry"""
+        try:
+            with self._lock:
+                self._memory.pop(key, None)
+                conn = self._connect()
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("Cache delete failed: %s", e)
+
+    def clear(self):
+        """Remove every entry"""
+        try:
+            with self._lock:
+                self._memory.clear()
+                conn = self._connect()
+                conn.execute("DELETE FROM cache")
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("Cache clear failed: %s", e)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+cache = Cache()
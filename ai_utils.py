@@ -3,9 +3,21 @@ AI Utilities for Smart Study Assistant
 Handles all Gemini API interactions
 """
 
+import asyncio
+import datetime
+import functools
+import json
 import os
+import re
+import tempfile
+import threading
+import time
 from dotenv import load_dotenv
+import config
+from ai_cache import cache, make_key
 from logger import get_logger
+from rate_limiter import bucket
+from semantic_cache import semantic_cache
 
 load_dotenv()
 logger = get_logger(__name__)
@@ -19,10 +31,11 @@ try:
     GEMINI_KEY = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
     if GEMINI_KEY:
         try:
-            genai.configure(api_key=GEMINI_KEY)
+            # One process-wide transport; every model shares its channel
+            genai.configure(api_key=GEMINI_KEY, transport=config.GEMINI_TRANSPORT)
             logger.info("Gemini API configured successfully")
         except Exception as e:
-            logger.error(f"Gemini API configuration failed: {e}")
+            logger.error("Gemini API configuration failed: %s", e)
             GENAI_AVAILABLE = False
     else:
         logger.warning("GEMINI_API_KEY not found")
@@ -31,29 +44,426 @@ except ImportError:
     GENAI_AVAILABLE = False
     logger.warning("google-generativeai package not installed")
 
+# The Batch API is only exposed by the newer google-genai SDK
+try:
+    from google import genai as genai_sdk
 
-def _get_model():
-    """Get Gemini model instance with fallback"""
-    if not GENAI_AVAILABLE:
-        return None
+    BATCH_AVAILABLE = bool(os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY"))
+except ImportError:
+    genai_sdk = None
+    BATCH_AVAILABLE = False
 
-    model_names = [
-        "gemini-2.5-flash",
-        "gemini-flash-latest",
-        "gemini-pro-latest",
-        "gemini-2.0-flash-exp",
-    ]
+_BATCH_CLIENT = None
+
+# Optional local keyword extractor
+try:
+    import yake
+
+    YAKE_AVAILABLE = True
+except ImportError:
+    YAKE_AVAILABLE = False
+
+
+# Models to try, in order of preference
+MODEL_NAMES = (
+    "gemini-2.5-flash",
+    "gemini-flash-latest",
+    "gemini-pro-latest",
+    "gemini-2.0-flash-exp",
+)
+
+# Structured output schemas (Gemini returns JSON matching these)
+_QA_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {"question": {"type": "STRING"}, "answer": {"type": "STRING"}},
+        "required": ["question", "answer"],
+    },
+}
+_KEYWORDS_SCHEMA = {"type": "ARRAY", "items": {"type": "STRING"}}
+_SUMMARIES_SCHEMA = {"type": "ARRAY", "items": {"type": "STRING"}}
+_DIFFICULTY_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "level": {"type": "STRING", "enum": ["Easy", "Medium", "Hard"]},
+        "explanation": {"type": "STRING"},
+    },
+    "required": ["level", "explanation"],
+}
+
+# Fallback parsers for plain-text replies: "Q1: ... / A1: ..." pairs and
+# "Level:"/"Explanation:" lines
+_QA_RE = re.compile(
+    r"^\s*Q\d*:\s*(.+?)\s*\n\s*A\d*:\s*(.+?)\s*(?=\n\s*Q\d*:|\Z)", re.M | re.S
+)
+_SENTENCE_RE = re.compile(r"[.!?]+(?:\s|$)")
+_WORD_RE = re.compile(r"[A-Za-z]+")
+_VOWEL_GROUP_RE = re.compile(r"[aeiouy]+")
+_LEVEL_RE = re.compile(r"^\s*Level:\s*(.+)$", re.M)
+_EXPLANATION_RE = re.compile(r"^\s*Explanation:\s*(.+)$", re.M)
+
+_MODEL = None
+_MODEL_LOCK = threading.Lock()
+_LIGHT_MODEL_MISSING = False  # set once config.LIGHT_MODEL returns 404
+
+
+# Prompt templates: only the short header takes parameters; the user text
+# is appended unchanged after it
+_SUM_PRE = """Please summarize the following text concisely in {n} bullet points or less. 
+Make it clear and informative. End with a brief TL;DR.
+
+Text to summarize:
+"""
+_MULTI_SUM_PRE = """Summarize each of the following {n} documents separately, each concisely in {m} bullet points or less.
+Make each summary clear and informative and end it with a brief TL;DR.
+Return a JSON array of exactly {n} strings: one summary per document, in order.
+"""
+_FC_PRE = """Generate exactly {n} flashcard question-answer pairs from this text.
+Return a JSON array of objects with "question" and "answer" fields.
+
+Make questions clear, specific, and test key concepts. Keep answers concise but complete.
+
+Text:
+"""
+_REWRITE_PRE = "{n}\n\n"
+# Rewrite instructions by style (unknown styles fall back to paraphrase)
+STYLE_PROMPTS = {
+    "paraphrase": "Rewrite the following text using different words while keeping the same meaning:",
+    "simplify": "Simplify the following text to make it easier to understand:",
+    "formal": "Rewrite the following text in a more formal, academic style:",
+    "casual": "Rewrite the following text in a more casual, conversational style:",
+}
+_REWRITE_POST = "\n\nProvide only the rewritten text without any explanations."
+_KW_PRE = """Extract the {n} most important keywords or key concepts from this text.
+Return them as a JSON array of strings, without numbering or explanations.
+
+Text:
+"""
+_QUIZ_PRE = """Based on the following study notes, generate {n} intelligent quiz questions that test understanding of the key concepts.
+
+Requirements:
+- Create questions that test comprehension, not just memorization
+- Mix question types: fill-in-the-blank, short answer, and conceptual questions
+- Provide clear, concise answers
+- Focus on the most important concepts in the text
+
+Return a JSON array of {n} objects with "question" and "answer" fields.
+
+Study Notes:
+"""
+_PROCESS_PRE = """Analyze the following study notes and return a single JSON object with these keys:
+- "summary": a concise summary in 6 bullet points or less, ending with a brief TL;DR
+- "flashcards": exactly {cards} objects with "question" and "answer"
+- "keywords": the {keywords} most important keywords as a list of strings
+- "difficulty": an object with "level" (Easy, Medium or Hard) and a one-sentence "explanation"
+- "quiz": {questions} objects with "question" and "answer" that test comprehension
+
+Study Notes:
+"""
+_DIFFICULTY_PRE = """Assess the difficulty level of this educational content.
+Return a JSON object with:
+- "level": Easy, Medium, or Hard
+- "explanation": a brief one-sentence explanation
+
+Text:
+"""
+
+
+# Replaces the note text in a prompt when the note lives in a context cache
+_IN_CONTEXT = "(the study notes are provided above)"
 
-    for model_name in model_names:
+
+@functools.lru_cache(maxsize=64)
+def _prompt_header(template, n):
+    """Format a template header once per distinct parameter"""
+    return template.format(n=n)
+
+
+def _json_config(schema):
+    """generation_config that forces JSON output matching schema"""
+    return {"response_mime_type": "application/json", "response_schema": schema}
+
+
+def _forget_missing_model(error, model=None):
+    """Re-probe models on the next call if the current one has gone away
+
+    If the missing model is config.LIGHT_MODEL, later small inputs go to
+    the shared model instead of retrying it.
+    """
+    global _LIGHT_MODEL_MISSING
+    text = str(error)
+    if "404" in text or "not found" in text.lower():
+        model_name = getattr(model, "model_name", "") or ""
+        if model_name.split("/", 1)[-1] == config.LIGHT_MODEL:
+            logger.warning(
+                "Gemini model %s unavailable (%s) - using the main model",
+                config.LIGHT_MODEL,
+                text,
+            )
+            _LIGHT_MODEL_MISSING = True
+            return
+        logger.warning("Gemini model unavailable (%s) - will re-probe", text)
+        reset_model()
+
+
+def _response_text(response):
+    """Stripped text of a Gemini response, or "" if it has none"""
+    try:
+        return response.text.strip()
+    except (AttributeError, ValueError):
+        # .text raises ValueError when the first candidate has no text part
+        try:
+            return response.candidates[0].content.parts[0].text.strip()
+        except (AttributeError, IndexError, TypeError):
+            return ""
+
+
+def _generate(model, prompt, **kwargs):
+    """model.generate_content, throttled by the shared token bucket"""
+    with bucket.reserve(est_tokens=len(prompt) // 4):
         try:
-            model = genai.GenerativeModel(model_name)
-            logger.info(f"Using Gemini model: {model_name}")
-            return model
+            return model.generate_content(prompt, **kwargs)
         except Exception as e:
-            logger.debug(f"Model {model_name} not available: {e}")
-            continue
+            _forget_missing_model(e, model)
+            raise
+
+
+async def _generate_async(model, prompt, **kwargs):
+    """model.generate_content_async, throttled by the shared token bucket"""
+    # Wait for capacity off the event loop so other requests keep running
+    await asyncio.to_thread(bucket.acquire, len(prompt) // 4)
+    try:
+        return await model.generate_content_async(prompt, **kwargs)
+    except Exception as e:
+        _forget_missing_model(e, model)
+        raise
+
+
+def _pick_model_name():
+    """First of MODEL_NAMES this API key can use, from one list_models() call
+
+    Falls back to any Gemini model supporting generateContent, and to
+    MODEL_NAMES[0] if listing fails.
+    """
+    try:
+        available = [
+            m.name.split("/", 1)[-1]
+            for m in genai.list_models()
+            if "generateContent" in m.supported_generation_methods
+            and m.name.startswith("models/gemini")
+        ]
+    except Exception as e:
+        logger.debug("Could not list Gemini models: %s", e)
+        return MODEL_NAMES[0]
+    for model_name in MODEL_NAMES:
+        if model_name in available:
+            return model_name
+    return available[0] if available else MODEL_NAMES[0]
+
+
+@functools.lru_cache(maxsize=8)
+def _light_model(model_name):
+    """GenerativeModel for a small-input model, built once per name"""
+    return genai.GenerativeModel(model_name)
+
+
+def _get_model(purpose=None, n_chars=0):
+    """Get Gemini model instance with fallback (built once per process)
+
+    Short inputs for the purposes in config.LIGHT_MODEL_PURPOSES go to the
+    cheaper config.LIGHT_MODEL (until it has returned 404); everything else
+    uses the shared model.
+    """
+    global _MODEL
+    if not GENAI_AVAILABLE:
+        return None
+
+    if (
+        not _LIGHT_MODEL_MISSING
+        and purpose in config.LIGHT_MODEL_PURPOSES
+        and n_chars < config.LIGHT_MODEL_MAX_CHARS
+    ):
+        return _light_model(config.LIGHT_MODEL)
+
+    if _MODEL is not None:
+        return _MODEL
+
+    with _MODEL_LOCK:
+        if _MODEL is None:
+            model_name = _pick_model_name()
+            try:
+                _MODEL = genai.GenerativeModel(model_name)
+                logger.info("Using Gemini model: %s", model_name)
+            except Exception as e:
+                logger.error("Could not create Gemini model %s: %s", model_name, e)
+    return _MODEL
+
+
+def _get_batch_client():
+    """Shared google-genai client (keeps its HTTP connection pool alive)"""
+    global _BATCH_CLIENT
+    with _MODEL_LOCK:
+        if _BATCH_CLIENT is None:
+            _BATCH_CLIENT = genai_sdk.Client(
+                http_options={"timeout": config.GEMINI_TIMEOUT * 1000}
+            )
+    return _BATCH_CLIENT
+
+
+def _context_model(text):
+    """Model bound to a Gemini context cache holding text, or None
+
+    Only notes of at least config.CONTEXT_CACHE_MIN_CHARS are cached. The
+    cache name is remembered in the SQLite cache under the text hash, so
+    summarizing, making flashcards and quizzing the same note pay for its
+    tokens once. An edited note hashes differently and gets a fresh cache;
+    the stale one expires after config.CONTEXT_CACHE_TTL.
+    """
+    if not config.CONTEXT_CACHE_ENABLED or len(text) < config.CONTEXT_CACHE_MIN_CHARS:
+        return None
+
+    key = make_key("context_cache", text)
+    try:
+        content = None
+        name = cache.get(key)
+        if name:
+            try:
+                content = genai.caching.CachedContent.get(name)
+            except Exception:
+                content = None
+        if content is None:
+            content = genai.caching.CachedContent.create(
+                model=f"models/{config.CONTEXT_CACHE_MODEL}",
+                contents=[text],
+                ttl=datetime.timedelta(seconds=config.CONTEXT_CACHE_TTL),
+            )
+            # Forget the handle a little before Gemini expires it
+            cache.set(key, content.name, ttl=config.CONTEXT_CACHE_TTL - 30)
+            logger.info("Created context cache %s", content.name)
+        return genai.GenerativeModel.from_cached_content(cached_content=content)
+    except Exception as e:
+        logger.debug("Context caching unavailable: %s", e)
+        return None
+
+
+def _model_and_prompt(text, template, n, budget):
+    """Pick a context-cached model when possible, else the shared model
 
-    return None
+    text is trimmed to the caller's token budget before it is cached.
+
+    Returns: (model, prompt)
+    """
+    context_model = _context_model(_fit_tokens(text, budget))
+    if context_model is not None:
+        return context_model, _prompt_header(template, n) + _IN_CONTEXT
+    return _get_model(), None
+
+
+def reset_model():
+    """Forget the cached models so the next call rebuilds them"""
+    global _MODEL
+    with _MODEL_LOCK:
+        _MODEL = None
+    _light_model.cache_clear()
+
+
+def _count_tokens(text):
+    """Gemini token count for text (remembered per text hash), or None"""
+    key = make_key("count_tokens", text)
+    cached = _cache_get(key)
+    if cached is not None:
+        return int(cached)
+    model = _get_model()
+    if not model:
+        return None
+    try:
+        total = model.count_tokens(text).total_tokens
+    except Exception as e:
+        logger.debug("Token counting failed: %s", e)
+        return None
+    _cache_set(key, str(total))
+    return total
+
+
+@functools.lru_cache(maxsize=32)
+def _fit_tokens(text, budget):
+    """Longest prefix of text that fits in budget tokens
+
+    A token always covers at least one character, so text no longer than
+    budget is returned without asking the API. Otherwise the cut point is
+    narrowed by the measured chars-per-token ratio, which settles in a
+    couple of count_tokens calls. If counting fails, ~4 chars per token
+    is assumed.
+    """
+    if len(text) <= budget:
+        return text
+    total = _count_tokens(text)
+    if total is None:
+        return text[: budget * 4]
+    if total <= budget:
+        return text
+
+    lo, hi = budget, len(text)  # a prefix of `budget` chars always fits
+    length, count = len(text), total
+    for _ in range(4):
+        cut = min(hi - 1, int(length * budget / count))
+        if cut <= lo:
+            break
+        length, count = cut, _count_tokens(text[:cut])
+        if count is None:
+            break
+        if count <= budget:
+            lo = cut
+            # Within 5% of the budget is close enough
+            if count >= budget * 0.95:
+                break
+        else:
+            hi = cut
+    return text[:lo]
+
+
+def _cache_get(key):
+    """Look up a cached response when caching is enabled"""
+    if not config.CACHE_ENABLED:
+        return None
+    return cache.get(key)
+
+
+def _cache_set(key, value):
+    """Store a response when caching is enabled"""
+    if config.CACHE_ENABLED:
+        cache.set(key, value)
+
+
+def _embed(text):
+    """Embed text for the semantic cache; returns None when unavailable"""
+    if not (config.SEMANTIC_CACHE_ENABLED and semantic_cache.available):
+        return None
+    try:
+        result = genai.embed_content(model=config.EMBEDDING_MODEL, content=text[:2048])
+        return result["embedding"]
+    except Exception as e:
+        logger.debug("Embedding failed: %s", e)
+        return None
+
+
+def _semantic_get(namespace, vector):
+    """Return a cached response for a near-duplicate input, if any"""
+    if vector is None:
+        return None
+    return semantic_cache.lookup(namespace, vector)
+
+
+def _semantic_set(namespace, vector, value):
+    """Remember a response under its input embedding"""
+    if vector is not None:
+        semantic_cache.add(namespace, vector, value)
+
+
+def _summary_prompt(text, max_sentences):
+    """Build the summarization prompt"""
+    return _prompt_header(_SUM_PRE, max_sentences) + _fit_tokens(text, config.SUMMARY_TOKEN_BUDGET)
 
 
 def summarize_text(text, max_sentences=6):
@@ -64,36 +474,38 @@ def summarize_text(text, max_sentences=6):
     if not GENAI_AVAILABLE:
         return "Error: Gemini API not available"
 
+    key = make_key("summarize_text", text, max_sentences)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info("Summary served from cache")
+        return cached
+
+    namespace = f"summarize_text|{max_sentences}"
+    vector = _embed(text)
+    similar = _semantic_get(namespace, vector)
+    if similar is not None:
+        logger.info("Summary served from semantic cache")
+        _cache_set(key, similar)
+        return similar
+
     try:
-        model = _get_model()
+        model, prompt = _model_and_prompt(
+            text, _SUM_PRE, max_sentences, config.SUMMARY_TOKEN_BUDGET
+        )
         if not model:
             return "Error: No Gemini model available"
 
-        prompt = f"""Please summarize the following text concisely in {max_sentences} bullet points or less. 
-Make it clear and informative. End with a brief TL;DR.
-
-Text to summarize:
-{text[:10000]}"""
+        prompt = prompt or _summary_prompt(text, max_sentences)
 
         logger.info("Sending summarization request to Gemini API")
-        response = model.generate_content(prompt)
+        response = _generate(model, prompt)
 
-        if response and hasattr(response, "text") and response.text:
-            summary = response.text.strip()
-            logger.info(f"Received summary ({len(summary)} chars)")
+        summary = _response_text(response)
+        if summary:
+            logger.info("Received summary (%d chars)", len(summary))
+            _cache_set(key, summary)
+            _semantic_set(namespace, vector, summary)
             return summary
-        elif response and hasattr(response, "candidates"):
-            for candidate in response.candidates:
-                if hasattr(candidate, "content") and hasattr(
-                    candidate.content, "parts"
-                ):
-                    for part in candidate.content.parts:
-                        if hasattr(part, "text") and part.text:
-                            summary = part.text.strip()
-                            logger.info(
-                                f"Received summary from candidate ({len(summary)} chars)"
-                            )
-                            return summary
 
         return "Error: Could not extract summary from API response"
 
@@ -103,6 +515,88 @@ Text to summarize:
         return error_msg
 
 
+def summarize_text_stream(text, max_sentences=6):
+    """Summarize text, yielding pieces of the summary as Gemini produces them
+
+    The full summary is cached once the stream completes, so a repeat
+    request yields the cached text in a single piece. An API error part-way
+    through is raised to the caller and nothing is cached.
+    """
+    if not text or not text.strip():
+        yield "No text to summarize."
+        return
+
+    if not GENAI_AVAILABLE:
+        yield "Error: Gemini API not available"
+        return
+
+    key = make_key("summarize_text", text, max_sentences)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info("Summary served from cache")
+        yield cached
+        return
+
+    model, prompt = _model_and_prompt(
+        text, _SUM_PRE, max_sentences, config.SUMMARY_TOKEN_BUDGET
+    )
+    if not model:
+        yield "Error: No Gemini model available"
+        return
+    prompt = prompt or _summary_prompt(text, max_sentences)
+
+    parts = []
+    try:
+        logger.info("Streaming summarization request to Gemini API")
+        for chunk in _generate(model, prompt, stream=True):
+            try:
+                piece = chunk.text
+            except ValueError:
+                # Chunk without text parts (e.g. safety metadata only)
+                continue
+            if piece:
+                parts.append(piece)
+                yield piece
+    except Exception as e:
+        # Raise instead of yielding the message, so callers can't mistake it
+        # for (and cache it as) part of the summary
+        logger.error("Summarization error: %s", e)
+        raise
+
+    summary = "".join(parts).strip()
+    if summary:
+        logger.info("Streamed summary (%d chars)", len(summary))
+        _cache_set(key, summary)
+
+
+def _flashcards_prompt(text, num_cards):
+    """Build the flashcard generation prompt"""
+    return _prompt_header(_FC_PRE, num_cards) + _fit_tokens(text, config.FLASHCARD_TOKEN_BUDGET)
+
+
+def _qa_items(items):
+    """Question/answer dicts from a decoded JSON array, dropping malformed items"""
+    if not isinstance(items, list):
+        return []
+    return [
+        {"question": str(i["question"]).strip(), "answer": str(i["answer"]).strip()}
+        for i in items
+        if isinstance(i, dict) and i.get("question") and i.get("answer")
+    ]
+
+
+def _parse_flashcards(response_text):
+    """Parse a JSON question/answer array (or 'Q:'/'A:' text) into dicts"""
+    try:
+        items = json.loads(response_text)
+    except ValueError:
+        return [
+            {"question": q.strip(), "answer": a.strip()}
+            for q, a in _QA_RE.findall(response_text)
+        ]
+    return _qa_items(items)
+
+
 def generate_flashcards(text, num_cards=5):
     """Generate flashcards from text using Gemini API"""
     if not text or not text.strip():
@@ -112,46 +606,37 @@ def generate_flashcards(text, num_cards=5):
         logger.warning("Gemini API not available for flashcard generation")
         return []
 
+    key = make_key("generate_flashcards", text, num_cards)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info("Flashcards served from cache")
+        return json.loads(cached)
+
     try:
-        model = _get_model()
+        model, prompt = _model_and_prompt(
+            text, _FC_PRE, num_cards, config.FLASHCARD_TOKEN_BUDGET
+        )
         if not model:
             return []
 
-        prompt = f"""Generate exactly {num_cards} flashcard question-answer pairs from this text.
-Format each flashcard as:
-Q: [question]
-A: [answer]
-
-Make questions clear, specific, and test key concepts. Keep answers concise but complete.
-
-Text:
-{text[:5000]}"""
+        prompt = prompt or _flashcards_prompt(text, num_cards)
 
-        logger.info(f"Generating {num_cards} flashcards")
-        response = model.generate_content(prompt)
+        logger.info("Generating %d flashcards", num_cards)
+        response = _generate(model, prompt, generation_config=_json_config(_QA_SCHEMA))
 
-        if not response or not hasattr(response, "text"):
+        raw = _response_text(response)
+        if not raw:
             return []
 
-        # Parse flashcards from response
-        flashcards = []
-        lines = response.text.strip().split("\n")
-        current_q = None
-
-        for line in lines:
-            line = line.strip()
-            if line.startswith("Q:"):
-                current_q = line[2:].strip()
-            elif line.startswith("A:") and current_q:
-                current_a = line[2:].strip()
-                flashcards.append({"question": current_q, "answer": current_a})
-                current_q = None
-
-        logger.info(f"Generated {len(flashcards)} flashcards")
+        flashcards = _parse_flashcards(raw)[:num_cards]
+
+        logger.info("Generated %d flashcards", len(flashcards))
+        if flashcards:
+            _cache_set(key, json.dumps(flashcards))
         return flashcards
 
     except Exception as e:
-        logger.error(f"Flashcard generation error: {e}")
+        logger.error("Flashcard generation error: %s", e)
         return []
 
 
@@ -168,30 +653,41 @@ def rewrite_text(text, style="paraphrase"):
     if not GENAI_AVAILABLE:
         return "Error: Gemini API not available"
 
+    key = make_key("rewrite_text", text, style)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info("Rewrite served from cache")
+        return cached
+
+    namespace = f"rewrite_text|{style}"
+    vector = _embed(text)
+    similar = _semantic_get(namespace, vector)
+    if similar is not None:
+        logger.info("Rewrite served from semantic cache")
+        _cache_set(key, similar)
+        return similar
+
     try:
         model = _get_model()
         if not model:
             return "Error: No Gemini model available"
 
-        style_prompts = {
-            "paraphrase": "Rewrite the following text using different words while keeping the same meaning:",
-            "simplify": "Simplify the following text to make it easier to understand:",
-            "formal": "Rewrite the following text in a more formal, academic style:",
-            "casual": "Rewrite the following text in a more casual, conversational style:",
-        }
-
-        prompt = f"""{style_prompts.get(style, style_prompts['paraphrase'])}
-
-{text[:3000]}
-
-Provide only the rewritten text without any explanations."""
-
-        logger.info(f"Rewriting text with style: {style}")
-        response = model.generate_content(prompt)
-
-        if response and hasattr(response, "text") and response.text:
-            rewritten = response.text.strip()
-            logger.info(f"Text rewritten ({len(rewritten)} chars)")
+        prompt = "".join(
+            (
+                _prompt_header(_REWRITE_PRE, STYLE_PROMPTS.get(style, STYLE_PROMPTS["paraphrase"])),
+                _fit_tokens(text, config.REWRITE_TOKEN_BUDGET),
+                _REWRITE_POST,
+            )
+        )
+
+        logger.info("Rewriting text with style: %s", style)
+        response = _generate(model, prompt)
+
+        rewritten = _response_text(response)
+        if rewritten:
+            logger.info("Text rewritten (%d chars)", len(rewritten))
+            _cache_set(key, rewritten)
+            _semantic_set(namespace, vector, rewritten)
             return rewritten
 
         return "Error: Could not generate rewritten text"
@@ -202,41 +698,90 @@ Provide only the rewritten text without any explanations."""
         return error_msg
 
 
-def extract_keywords(text, max_keywords=10):
-    """Extract key terms/concepts from text"""
+def _local_keywords(text, max_keywords):
+    """Extract keywords on the CPU with YAKE, or the quizgen frequency heuristic"""
+    if YAKE_AVAILABLE:
+        try:
+            extractor = yake.KeywordExtractor(n=2, top=max_keywords)
+            return [k for k, _ in extractor.extract_keywords(text)][:max_keywords]
+        except Exception as e:
+            logger.debug("YAKE extraction failed: %s", e)
+
+    from modules import quizgen
+
+    return quizgen.extract_keywords(text, n=max_keywords)
+
+
+def extract_keywords(text, max_keywords=10, use_llm=False):
+    """Extract key terms/concepts from text
+
+    Args:
+        text: Text to analyze
+        max_keywords: Maximum number of keywords to return
+        use_llm: Ask Gemini instead of extracting locally (slower, costs tokens)
+    """
     if not text or not text.strip():
         return []
 
+    if not use_llm:
+        keywords = _local_keywords(text[:3000], max_keywords)
+        logger.info("Extracted %d keywords locally", len(keywords))
+        return keywords
+
     if not GENAI_AVAILABLE:
         return []
 
+    key = make_key("extract_keywords", text, max_keywords)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info("Keywords served from cache")
+        return json.loads(cached)
+
+    namespace = f"extract_keywords|{max_keywords}"
+    vector = _embed(text)
+    similar = _semantic_get(namespace, vector)
+    if similar is not None:
+        logger.info("Keywords served from semantic cache")
+        _cache_set(key, similar)
+        return json.loads(similar)
+
     try:
-        model = _get_model()
+        model = _get_model("keywords", len(text))
         if not model:
             return []
 
-        prompt = f"""Extract the {max_keywords} most important keywords or key concepts from this text.
-Provide only the keywords, separated by commas, without numbering or explanations.
-
-Text:
-{text[:3000]}"""
+        prompt = _prompt_header(_KW_PRE, max_keywords) + _fit_tokens(
+            text, config.KEYWORD_TOKEN_BUDGET
+        )
 
         logger.info("Extracting keywords")
-        response = model.generate_content(prompt)
+        response = _generate(model, prompt, generation_config=_json_config(_KEYWORDS_SCHEMA))
 
-        if response and hasattr(response, "text") and response.text:
-            keywords_text = response.text.strip()
-            keywords = [k.strip() for k in keywords_text.split(",")]
-            logger.info(f"Extracted {len(keywords)} keywords")
-            return keywords[:max_keywords]
+        raw = _response_text(response)
+        if raw:
+            keywords = [str(k).strip() for k in json.loads(raw)][:max_keywords]
+            logger.info("Extracted %d keywords", len(keywords))
+            _cache_set(key, json.dumps(keywords))
+            _semantic_set(namespace, vector, json.dumps(keywords))
+            return keywords
 
         return []
 
     except Exception as e:
-        logger.error(f"Keyword extraction error: {e}")
+        logger.error("Keyword extraction error: %s", e)
         return []
 
 
+def _quiz_prompt(text, num_questions):
+    """Build the quiz generation prompt"""
+    return _prompt_header(_QUIZ_PRE, num_questions) + _fit_tokens(text, config.QUIZ_TOKEN_BUDGET)
+
+
+def _parse_quiz(response_text):
+    """Parse a JSON question/answer array (or 'Qn:'/'An:' text) into dicts"""
+    return _parse_flashcards(response_text)
+
+
 def generate_quiz_questions(text, num_questions=5):
     """Generate intelligent quiz questions from text using Gemini AI
     
@@ -253,131 +798,583 @@ def generate_quiz_questions(text, num_questions=5):
         logger.warning("Gemini API not available for quiz generation")
         return []
 
+    key = make_key("generate_quiz_questions", text, num_questions)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info("Quiz questions served from cache")
+        return json.loads(cached)
+
     try:
-        model = _get_model()
+        model, prompt = _model_and_prompt(
+            text, _QUIZ_PRE, num_questions, config.QUIZ_TOKEN_BUDGET
+        )
         if not model:
             logger.error("No Gemini model available")
             return []
 
-        prompt = f"""Based on the following study notes, generate {num_questions} intelligent quiz questions that test understanding of the key concepts.
-
-Requirements:
-- Create questions that test comprehension, not just memorization
-- Mix question types: fill-in-the-blank, short answer, and conceptual questions
-- Provide clear, concise answers
-- Focus on the most important concepts in the text
-
-Format your response EXACTLY as follows (one question per block):
-
-Q1: [Your first question here]
-A1: [Answer to first question]
-
-Q2: [Your second question here]
-A2: [Answer to second question]
+        prompt = prompt or _quiz_prompt(text, num_questions)
 
-[Continue for all {num_questions} questions]
+        logger.info("Generating %d quiz questions using Gemini AI", num_questions)
+        response = _generate(model, prompt, generation_config=_json_config(_QA_SCHEMA))
 
-Study Notes:
-{text[:8000]}"""
-
-        logger.info(f"Generating {num_questions} quiz questions using Gemini AI")
-        response = model.generate_content(prompt)
-
-        if response and hasattr(response, "text") and response.text:
-            response_text = response.text.strip()
-            questions = []
-            
-            # Parse the response
-            lines = response_text.split('\n')
-            current_question = None
-            current_answer = None
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                # Check for question (Q1:, Q2:, etc.)
-                if line.startswith('Q') and ':' in line:
-                    # Save previous Q&A if exists
-                    if current_question and current_answer:
-                        questions.append({
-                            "question": current_question,
-                            "answer": current_answer
-                        })
-                    # Start new question
-                    current_question = line.split(':', 1)[1].strip()
-                    current_answer = None
-                    
-                # Check for answer (A1:, A2:, etc.)
-                elif line.startswith('A') and ':' in line:
-                    current_answer = line.split(':', 1)[1].strip()
-            
-            # Don't forget the last Q&A pair
-            if current_question and current_answer:
-                questions.append({
-                    "question": current_question,
-                    "answer": current_answer
-                })
-            
-            logger.info(f"Successfully generated {len(questions)} quiz questions")
-            return questions[:num_questions]  # Ensure we don't exceed requested number
+        raw = _response_text(response)
+        if raw:
+            questions = _parse_quiz(raw)[:num_questions]  # Ensure we don't exceed requested number
+            logger.info("Successfully generated %d quiz questions", len(questions))
+            if questions:
+                _cache_set(key, json.dumps(questions))
+            return questions
 
         logger.warning("No text in Gemini response")
         return []
 
     except Exception as e:
-        logger.error(f"Quiz generation error: {e}")
+        logger.error("Quiz generation error: %s", e)
         return []
 
 
+def _difficulty_fields(data):
+    """(level, explanation) from a decoded JSON object"""
+    return (
+        str(data.get("level") or "Medium").strip(),
+        str(data.get("explanation") or "").strip(),
+    )
+
+
+def _parse_difficulty(response_text):
+    """Return (level, explanation) from a JSON object or 'Level:' text"""
+    try:
+        return _difficulty_fields(json.loads(response_text))
+    except (ValueError, AttributeError):
+        level_match = _LEVEL_RE.search(response_text)
+        explanation_match = _EXPLANATION_RE.search(response_text)
+        level = level_match.group(1).strip() if level_match else "Medium"
+        explanation = explanation_match.group(1).strip() if explanation_match else ""
+        return level, explanation
+
+
+def _count_syllables(word):
+    """Rough syllable count: vowel groups, minus a silent trailing 'e'"""
+    word = word.lower()
+    count = len(_VOWEL_GROUP_RE.findall(word))
+    if word.endswith("e") and not word.endswith("le") and count > 1:
+        count -= 1
+    return max(1, count)
+
+
+def _quick_difficulty(text):
+    """Estimate difficulty locally from the Flesch-Kincaid grade level
+
+    Returns: result dict for clear Easy/Hard cases, or None when the
+    grade falls in the ambiguous band and Gemini should decide.
+    """
+    words = _WORD_RE.findall(text)
+    if not words:
+        return None
+    sentences = max(1, len(_SENTENCE_RE.findall(text)))
+    syllables = sum(_count_syllables(w) for w in words)
+    grade = 0.39 * (len(words) / sentences) + 11.8 * (syllables / len(words)) - 15.59
+
+    if grade < config.DIFFICULTY_EASY_GRADE:
+        level = "Easy"
+    elif grade > config.DIFFICULTY_HARD_GRADE:
+        level = "Hard"
+    else:
+        return None
+    return {
+        "level": level,
+        "explanation": f"Estimated reading grade level {grade:.1f} (Flesch-Kincaid)",
+    }
+
+
 def assess_difficulty(text):
     """Assess difficulty level of text content
 
+    Clear-cut cases are scored locally; only texts in the ambiguous
+    readability band are sent to Gemini.
+
     Returns: dict with 'level' (Easy/Medium/Hard) and 'explanation'
     """
     if not text or not text.strip():
         return {"level": "Unknown", "explanation": "No text provided"}
 
+    quick = _quick_difficulty(text[:2000])
+    if quick is not None:
+        logger.info("Difficulty estimated locally: %s", quick["level"])
+        return quick
+
     if not GENAI_AVAILABLE:
         return {"level": "Unknown", "explanation": "API not available"}
 
+    key = make_key("assess_difficulty", text)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info("Difficulty served from cache")
+        return json.loads(cached)
+
     try:
-        model = _get_model()
+        model = _get_model("difficulty", len(text))
         if not model:
             return {"level": "Unknown", "explanation": "Model not available"}
 
-        prompt = f"""Assess the difficulty level of this educational content.
-Provide:
-1. Difficulty Level: Easy, Medium, or Hard
-2. Brief explanation (one sentence)
-
-Format your response as:
-Level: [Easy/Medium/Hard]
-Explanation: [brief explanation]
-
-Text:
-{text[:2000]}"""
+        prompt = _DIFFICULTY_PRE + _fit_tokens(text, config.DIFFICULTY_TOKEN_BUDGET)
 
         logger.info("Assessing content difficulty")
-        response = model.generate_content(prompt)
-
-        if response and hasattr(response, "text") and response.text:
-            result_text = response.text.strip()
-            level = "Medium"
-            explanation = ""
+        response = _generate(model, prompt, generation_config=_json_config(_DIFFICULTY_SCHEMA))
 
-            for line in result_text.split("\n"):
-                if line.startswith("Level:"):
-                    level = line.split(":", 1)[1].strip()
-                elif line.startswith("Explanation:"):
-                    explanation = line.split(":", 1)[1].strip()
+        raw = _response_text(response)
+        if raw:
+            level, explanation = _parse_difficulty(raw)
 
-            logger.info(f"Difficulty assessed: {level}")
-            return {"level": level, "explanation": explanation}
+            logger.info("Difficulty assessed: %s", level)
+            result = {"level": level, "explanation": explanation}
+            _cache_set(key, json.dumps(result))
+            return result
 
         return {"level": "Unknown", "explanation": "Could not assess"}
 
     except Exception as e:
-        logger.error(f"Difficulty assessment error: {e}")
+        logger.error("Difficulty assessment error: %s", e)
         return {"level": "Unknown", "explanation": str(e)}
+
+
+def process_note(text, num_cards=5, num_questions=5, max_keywords=10):
+    """Run every analysis on a note in a single Gemini request
+
+    Returns: dict with 'summary', 'flashcards', 'keywords', 'difficulty'
+    and 'quiz' keys, or an empty dict on failure. Each artifact is also
+    seeded into the per-function cache so later individual calls are free.
+    """
+    if not text or not text.strip():
+        return {}
+
+    if not GENAI_AVAILABLE:
+        logger.warning("Gemini API not available for note processing")
+        return {}
+
+    key = make_key("process_note", text, num_cards, num_questions, max_keywords)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info("Note analysis served from cache")
+        return json.loads(cached)
+
+    try:
+        model = _get_model()
+        if not model:
+            return {}
+
+        prompt = _PROCESS_PRE.format(
+            cards=num_cards, questions=num_questions, keywords=max_keywords
+        ) + _fit_tokens(text, config.QUIZ_TOKEN_BUDGET)
+
+        logger.info("Processing note in a single Gemini request")
+        response = _generate(
+            model, prompt, generation_config={"response_mime_type": "application/json"}
+        )
+
+        raw = _response_text(response)
+        if not raw:
+            return {}
+
+        data = json.loads(raw)
+        if not isinstance(data, dict):
+            logger.warning("Note analysis was not a JSON object - not cached")
+            return {}
+
+        # Same shape checks as the single-feature parsers, so nothing
+        # malformed is seeded into their caches
+        difficulty = data.get("difficulty")
+        if isinstance(difficulty, dict):
+            level, explanation = _difficulty_fields(difficulty)
+            difficulty = {"level": level, "explanation": explanation}
+        else:
+            difficulty = None
+        keywords = data.get("keywords")
+        if not isinstance(keywords, list):
+            keywords = []
+        result = {
+            "summary": str(data.get("summary", "")).strip(),
+            "flashcards": _qa_items(data.get("flashcards"))[:num_cards],
+            "keywords": [str(k).strip() for k in keywords][:max_keywords],
+            "difficulty": difficulty
+            or {"level": "Unknown", "explanation": "Could not assess"},
+            "quiz": _qa_items(data.get("quiz"))[:num_questions],
+        }
+        logger.info("Note processed in one request")
+
+        # Only a complete analysis is reused as a whole; valid parts still
+        # seed their own caches below
+        if all(result[k] for k in ("summary", "flashcards", "keywords", "quiz")) and difficulty:
+            _cache_set(key, json.dumps(result))
+        if result["summary"]:
+            _cache_set(make_key("summarize_text", text, 6), result["summary"])
+        if result["flashcards"]:
+            _cache_set(
+                make_key("generate_flashcards", text, num_cards),
+                json.dumps(result["flashcards"]),
+            )
+        if result["keywords"]:
+            _cache_set(
+                make_key("extract_keywords", text, max_keywords),
+                json.dumps(result["keywords"]),
+            )
+        if result["quiz"]:
+            _cache_set(
+                make_key("generate_quiz_questions", text, num_questions),
+                json.dumps(result["quiz"]),
+            )
+        if difficulty is not None:
+            _cache_set(make_key("assess_difficulty", text), json.dumps(difficulty))
+        return result
+
+    except Exception as e:
+        logger.error("Note processing error: %s", e)
+        return {}
+
+
+def generate_all(text):
+    """Alias for process_note with default counts"""
+    return process_note(text)
+
+
+# ---------------- Batch generation ----------------
+
+_BATCH_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
+
+
+class BatchJob:
+    """Handle for a bulk generation request
+
+    Small requests are answered synchronously; larger ones are submitted
+    to the Gemini Batch API and polled on a background thread. Call
+    done() to check progress and results() once it returns True.
+    """
+
+    def __init__(self, kind, texts, on_complete=None):
+        self.kind = kind
+        self.texts = list(texts)
+        self.on_complete = on_complete
+        self.name = None
+        self.error = None
+        self._results = None
+        self._done = threading.Event()
+
+    def done(self):
+        return self._done.is_set()
+
+    def results(self):
+        """List of parsed results, one per input text (empty list on failure)"""
+        return self._results if self._results is not None else [[] for _ in self.texts]
+
+    def _finish(self, results, error=None):
+        self._results = results
+        self.error = error
+        self._done.set()
+        if self.on_complete:
+            try:
+                self.on_complete(self)
+            except Exception as e:
+                logger.error("Batch completion callback failed: %s", e)
+
+
+def _batch_prompt(kind, text, count):
+    if kind == "flashcards":
+        return _flashcards_prompt(text, count)
+    return _quiz_prompt(text, count)
+
+
+def _batch_parse(kind, response_text, count):
+    if kind == "flashcards":
+        return _parse_flashcards(response_text)[:count]
+    return _parse_quiz(response_text)[:count]
+
+
+def _run_sync(job, count):
+    """Fallback path: one request per text"""
+    fn = generate_flashcards if job.kind == "flashcards" else generate_quiz_questions
+    job._finish([fn(text, count) for text in job.texts])
+
+
+def _submit_batch(job, count):
+    """Upload a JSONL request file and create a Batch API job"""
+    client = _get_batch_client()
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    try:
+        with os.fdopen(fd, "w") as f:
+            for i, text in enumerate(job.texts):
+                prompt = _batch_prompt(job.kind, text, count)
+                request = {
+                    "key": f"n{i}",
+                    "request": {
+                        "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+                        "generation_config": {
+                            "response_mime_type": "application/json",
+                            "response_schema": _QA_SCHEMA,
+                        },
+                    },
+                }
+                f.write(json.dumps(request) + "\n")
+        uploaded = client.files.upload(
+            file=path,
+            config={"display_name": f"smartbyte-{job.kind}", "mime_type": "jsonl"},
+        )
+    finally:
+        os.remove(path)
+
+    batch = client.batches.create(
+        model=config.BATCH_MODEL,
+        src=uploaded.name,
+        config={"display_name": f"smartbyte-{job.kind}"},
+    )
+    job.name = batch.name
+    logger.info("Submitted batch job %s (%d requests)", batch.name, len(job.texts))
+    return client
+
+
+def _poll_batch(job, client, count):
+    """Wait for a Batch API job to finish and parse its output file"""
+    try:
+        while True:
+            batch = client.batches.get(name=job.name)
+            if batch.state.name in _BATCH_DONE_STATES:
+                break
+            time.sleep(config.BATCH_POLL_INTERVAL)
+
+        if batch.state.name != "JOB_STATE_SUCCEEDED":
+            logger.error("Batch job %s ended in state %s", job.name, batch.state.name)
+            job._finish(None, batch.state.name)
+            return
+
+        content = client.files.download(file=batch.dest.file_name).decode("utf-8")
+        results = [[] for _ in job.texts]
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            idx = int(item.get("key", "n-1")[1:])
+            try:
+                parts = item["response"]["candidates"][0]["content"]["parts"]
+                text = "".join(p.get("text", "") for p in parts)
+            except (KeyError, IndexError, TypeError):
+                continue
+            if 0 <= idx < len(results):
+                results[idx] = _batch_parse(job.kind, text, count)
+        logger.info("Batch job %s finished", job.name)
+        job._finish(results)
+    except Exception as e:
+        logger.error("Batch polling failed: %s", e)
+        job._finish(None, str(e))
+
+
+def _start_batch(kind, texts, count, on_complete):
+    job = BatchJob(kind, texts, on_complete)
+    if not job.texts:
+        job._finish([])
+        return job
+
+    if not BATCH_AVAILABLE or len(job.texts) < config.BATCH_MIN_SIZE:
+        threading.Thread(target=_run_sync, args=(job, count), daemon=True).start()
+        return job
+
+    try:
+        client = _submit_batch(job, count)
+    except Exception as e:
+        logger.warning("Batch submission failed, using sync path: %s", e)
+        threading.Thread(target=_run_sync, args=(job, count), daemon=True).start()
+        return job
+
+    threading.Thread(target=_poll_batch, args=(job, client, count), daemon=True).start()
+    return job
+
+
+def generate_flashcards_batch(texts, num_cards=5, on_complete=None):
+    """Generate flashcards for many notes at once
+
+    Returns: BatchJob whose results() is a list of flashcard lists
+    """
+    return _start_batch("flashcards", texts, num_cards, on_complete)
+
+
+def generate_quiz_batch(texts, num_questions=5, on_complete=None):
+    """Generate quiz questions for many notes at once
+
+    Returns: BatchJob whose results() is a list of question lists
+    """
+    return _start_batch("quiz", texts, num_questions, on_complete)
+
+
+# ---------------- Async fan-out ----------------
+
+_LOOP = None
+
+
+def _get_loop():
+    """Event loop running on a dedicated daemon thread (started on first use)"""
+    global _LOOP
+    with _MODEL_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(target=_LOOP.run_forever, daemon=True).start()
+    return _LOOP
+
+
+def run_async(coro):
+    """Schedule a coroutine from any thread (e.g. Tk); returns a concurrent Future"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+
+async def asummarize_text(text, max_sentences=6):
+    """Async version of summarize_text"""
+    if not text or not text.strip():
+        return "No text to summarize."
+
+    if not GENAI_AVAILABLE:
+        return "Error: Gemini API not available"
+
+    key = make_key("summarize_text", text, max_sentences)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        model = _get_model()
+        if not model:
+            return "Error: No Gemini model available"
+
+        response = await _generate_async(model, _summary_prompt(text, max_sentences))
+        summary = _response_text(response)
+        if summary:
+            _cache_set(key, summary)
+            return summary
+        return "Error: Could not extract summary from API response"
+
+    except Exception as e:
+        error_msg = f"Summarization error: {str(e)}"
+        logger.error(error_msg)
+        return error_msg
+
+
+async def agenerate_flashcards(text, num_cards=5):
+    """Async version of generate_flashcards"""
+    if not text or not text.strip() or not GENAI_AVAILABLE:
+        return []
+
+    key = make_key("generate_flashcards", text, num_cards)
+    cached = _cache_get(key)
+    if cached is not None:
+        return json.loads(cached)
+
+    try:
+        model = _get_model()
+        if not model:
+            return []
+
+        response = await _generate_async(
+            model,
+            _flashcards_prompt(text, num_cards),
+            generation_config=_json_config(_QA_SCHEMA),
+        )
+        raw = _response_text(response)
+        if not raw:
+            return []
+        flashcards = _parse_flashcards(raw)[:num_cards]
+        if flashcards:
+            _cache_set(key, json.dumps(flashcards))
+        return flashcards
+
+    except Exception as e:
+        logger.error("Flashcard generation error: %s", e)
+        return []
+
+
+async def _gather_bounded(fn, texts, *args):
+    """Run fn over texts concurrently, at most config.AI_MAX_CONCURRENCY at once"""
+    semaphore = asyncio.Semaphore(config.AI_MAX_CONCURRENCY)
+
+    async def _one(text):
+        async with semaphore:
+            return await fn(text, *args)
+
+    return await asyncio.gather(*(_one(t) for t in texts))
+
+
+async def _summarize_group(texts, max_sentences):
+    """Summarize several short texts with one request; None if the reply is unusable"""
+    model = _get_model()
+    if not model:
+        return None
+    prompt = "".join(
+        [_MULTI_SUM_PRE.format(n=len(texts), m=max_sentences)]
+        + [f"\n=== DOC {i} ===\n{t}\n" for i, t in enumerate(texts, 1)]
+    )
+    try:
+        response = await _generate_async(
+            model, prompt, generation_config=_json_config(_SUMMARIES_SCHEMA)
+        )
+        summaries = [str(x).strip() for x in json.loads(_response_text(response))]
+    except Exception as e:
+        logger.warning("Grouped summary request failed: %s", e)
+        return None
+    if len(summaries) != len(texts) or not all(summaries):
+        logger.warning("Grouped summary returned %d of %d summaries", len(summaries), len(texts))
+        return None
+    return summaries
+
+
+async def summarize_chunks(chunks, max_sentences=6):
+    """Summarize the chunks of one document with as few requests as possible
+
+    Uncached chunks are packed into groups of up to config.CHUNK_GROUP_CHARS
+    characters and each group is summarized in a single request, returning
+    one summary per chunk. Groups run concurrently; a group whose reply does
+    not parse falls back to one request per chunk. Results keep input order.
+    """
+    if not GENAI_AVAILABLE:
+        return ["Error: Gemini API not available"] * len(chunks)
+
+    results = [None] * len(chunks)
+    groups, group, size = [], [], 0
+    for i, chunk in enumerate(chunks):
+        cached = _cache_get(make_key("summarize_text", chunk, max_sentences))
+        if cached is not None:
+            results[i] = cached
+            continue
+        if group and size + len(chunk) > config.CHUNK_GROUP_CHARS:
+            groups.append(group)
+            group, size = [], 0
+        group.append(i)
+        size += len(chunk)
+    if group:
+        groups.append(group)
+
+    async def _one(indices):
+        texts = [chunks[i] for i in indices]
+        summaries = await _summarize_group(texts, max_sentences) if len(texts) > 1 else None
+        if summaries is None:
+            summaries = await _gather_bounded(asummarize_text, texts, max_sentences)
+        else:
+            for text, summary in zip(texts, summaries):
+                _cache_set(make_key("summarize_text", text, max_sentences), summary)
+        for i, summary in zip(indices, summaries):
+            results[i] = summary
+
+    logger.info("Summarizing %d chunks in %d requests", len(chunks), len(groups))
+    await asyncio.gather(*(_one(g) for g in groups))
+    return results
+
+
+async def summarize_many(texts, max_sentences=6):
+    """Summarize several texts concurrently; results keep input order"""
+    logger.info("Summarizing %d texts concurrently", len(texts))
+    return await _gather_bounded(asummarize_text, texts, max_sentences)
+
+
+async def generate_flashcards_many(texts, num_cards=5):
+    """Generate flashcards for several texts concurrently; results keep input order"""
+    logger.info("Generating flashcards for %d texts concurrently", len(texts))
+    return await _gather_bounded(agenerate_flashcards, texts, num_cards)
@@ -3,6 +3,8 @@ Configuration file for Smart Study Assistant
 Contains constants, colors, and settings
 """
 
+from types import MappingProxyType
+
 # UI Settings
 WINDOW_TITLE = "🎓 Smart Study Assistant"
 WINDOW_WIDTH = 1400
@@ -71,10 +73,60 @@ PADDING_LARGE = 15
 PADDING_XL = 20
 
 # Features
-AUTOSAVE_INTERVAL = 3000  # milliseconds (3 seconds)
+AUTOSAVE_DELAY = 1500  # milliseconds of inactivity before autosaving
 MAX_SEARCH_RESULTS = 50
+LAZY_LOAD_THRESHOLD = 64 * 1024  # notes this long load into the editor in slices
+LAZY_LOAD_FIRST = 8 * 1024  # characters shown immediately
+LAZY_LOAD_CHUNK = 16 * 1024  # characters inserted per event-loop tick
 TAG_COLORS = ["#4361ee", "#06d6a0", "#ef476f", "#ffc300", "#4cc9f0", "#7209b7"]
 
+# Gemini connection
+GEMINI_TRANSPORT = "grpc"  # persistent HTTP/2 channel shared by all calls
+GEMINI_TIMEOUT = 60  # seconds
+AI_MAX_CONCURRENCY = 5  # in-flight requests for multi-note operations
+# Quota for your API tier (defaults match the free tier of gemini-2.5-flash)
+GEMINI_RPM = 10  # requests per minute
+GEMINI_TPM = 250000  # input tokens per minute
+# Input size limits per request, in tokens
+SUMMARY_TOKEN_BUDGET = 6000
+QUIZ_TOKEN_BUDGET = 4000
+FLASHCARD_TOKEN_BUDGET = 3000
+REWRITE_TOKEN_BUDGET = 1500
+KEYWORD_TOKEN_BUDGET = 1500
+DIFFICULTY_TOKEN_BUDGET = 1000
+LONG_NOTE_CHARS = 24000  # longer notes are summarized chunk by chunk
+CHUNK_GROUP_CHARS = 20000  # chunks summarized together in one request
+
+# Cheaper model for short inputs to lightweight tasks
+LIGHT_MODEL = "gemini-2.5-flash-lite"
+LIGHT_MODEL_MAX_CHARS = 1000
+LIGHT_MODEL_PURPOSES = ("keywords", "difficulty")
+
+# AI response cache
+CACHE_ENABLED = True
+CACHE_FILE = "logs/ai_cache.sqlite"
+CACHE_TTL = 7 * 24 * 60 * 60  # seconds (1 week)
+CACHE_MEMORY_ENTRIES = 256  # recent entries also kept in memory
+SEMANTIC_CACHE_ENABLED = True
+SEMANTIC_CACHE_FILE = "logs/semantic_cache.npy"
+SEMANTIC_CACHE_THRESHOLD = 0.92  # cosine similarity needed for a hit
+EMBEDDING_MODEL = "models/text-embedding-004"
+
+# Gemini context caching for long notes reused across AI features
+CONTEXT_CACHE_ENABLED = True
+CONTEXT_CACHE_MIN_CHARS = 8000  # roughly the model's minimum cacheable size
+CONTEXT_CACHE_MODEL = "gemini-2.5-flash"
+CONTEXT_CACHE_TTL = 600  # seconds
+
+# Difficulty assessment - Flesch-Kincaid grades outside this band skip Gemini
+DIFFICULTY_EASY_GRADE = 8
+DIFFICULTY_HARD_GRADE = 12
+
+# Bulk AI generation (Gemini Batch API)
+BATCH_MIN_SIZE = 8  # fewer texts than this use regular requests
+BATCH_MODEL = "gemini-2.5-flash"
+BATCH_POLL_INTERVAL = 30  # seconds
+
 # Logging
 LOG_FILE = "logs/app.log"
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -97,3 +149,8 @@ XP_PER_NOTE = 10
 XP_PER_QUIZ = 25
 XP_PER_TIMER = 5
 LEVELS = [0, 100, 250, 500, 1000, 2000, 5000, 10000]  # XP thresholds for levels
+
+# Read-only views so shared lookup tables cannot be mutated at runtime
+LIGHT_COLORS = MappingProxyType(LIGHT_COLORS)
+DARK_COLORS = MappingProxyType(DARK_COLORS)
+SHORTCUTS = MappingProxyType(SHORTCUTS)
@@ -2,20 +2,38 @@
 Logging configuration for Smart Study Assistant
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 from config import LOG_FILE, LOG_FORMAT, LOG_LEVEL
 
 # Create logs directory if it doesn't exist
 os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format=LOG_FORMAT,
-    handlers=[logging.FileHandler(LOG_FILE), logging.StreamHandler()],
+# The real handlers run on a listener thread; callers only enqueue records
+_formatter = logging.Formatter(LOG_FORMAT)
+_file_handler = logging.FileHandler(LOG_FILE)
+_file_handler.setFormatter(_formatter)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_formatter)
+
+_log_queue = queue.Queue(-1)
+_listener = logging.handlers.QueueListener(
+    _log_queue, _file_handler, _stream_handler, respect_handler_level=True
 )
 
+# Only merge args into the message here; LOG_FORMAT is applied by the listener
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
+# Configure logging
+logging.basicConfig(level=getattr(logging, LOG_LEVEL), handlers=[_queue_handler])
+
+_listener.start()
+atexit.register(_listener.stop)
+
 
 def get_logger(name):
     """Get a logger instance for a module"""
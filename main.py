@@ -1,5 +1,13 @@
+import asyncio
+import atexit
+import functools
+import heapq
+import queue
+import re
 import threading
 import tkinter as tk
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import scrolledtext, messagebox, simpledialog
 from datetime import datetime, timedelta
 import time
@@ -22,8 +30,10 @@ from ui_components import (
     LoadingSpinner,
     AutosaveIndicator,
     SummaryModal,
+    TrackedText,
 )
 import ai_utils
+from ai_cache import cache, make_key
 
 # Setup logging
 logger = get_logger(__name__)
@@ -43,104 +53,316 @@ except ImportError:
     logger.warning("ttkbootstrap not installed. Install with: pip install ttkbootstrap")
 
 
+@functools.lru_cache(maxsize=512)
+def _format_date(raw_date, fmt="%b %d, %Y", default="No date"):
+    """Format an ISO timestamp for display (e.g. "Jan 05, 2025")"""
+    try:
+        return datetime.fromisoformat(raw_date).strftime(fmt)
+    except Exception:
+        return default
+
+
+def _format_minute(dt):
+    """dt as "YYYY-MM-DD HH:MM" (same as strftime, without the C call)"""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
+
+
+@functools.lru_cache(maxsize=512)
+def _format_short_ts(ts):
+    """Format a stored timestamp as "Jan 05 14:30" for the dashboard"""
+    # Stored notes use "YYYY-MM-DDTHH:MM..." - slice it instead of parsing
+    if len(ts) >= 16 and ts[4] == ts[7] == "-" and ts[10] in "T " and ts[13] == ":":
+        month = ts[5:7]
+        if month.isdigit() and 1 <= int(month) <= 12 and ts[8:10].isdigit():
+            return f"{_MONTHS[int(month) - 1]} {ts[8:10]} {ts[11:16]}"
+    return _format_date(ts, "%b %d %H:%M", ts[:16])
+
+
+_NEXT_RUN_FMT = "%b %d, %Y %H:%M"
+
+
+@functools.lru_cache(maxsize=256)
+def _format_next_run(nxt):
+    """Format a reminder's next run time (datetime or ISO string) for display"""
+    try:
+        next_time = datetime.fromisoformat(nxt) if isinstance(nxt, str) else nxt
+        return next_time.strftime(_NEXT_RUN_FMT)
+    except Exception:
+        return str(nxt)
+
+
+# A note as shown in the notes list, with display and search fields precomputed
+Note = namedtuple("Note", "id title text tags datetime xp title_lc text_lc tags_lc display")
+
+
+def _to_note(record):
+    """Build a Note from a storage.list_notes() record"""
+    nid = record.get("id")
+    title = str(record.get("title") or "")
+    text = str(record.get("text") or "")
+    raw_date = str(record.get("datetime") or "")
+    tags = str(record.get("tags") or "")
+    label = title.strip() or f"Untitled #{nid}"
+    return Note(
+        nid,
+        title,
+        text,
+        tags,
+        raw_date,
+        record.get("xp", 0),
+        title.lower(),
+        text.lower(),
+        tags.lower(),
+        f"📄 {label} - {_format_date(raw_date)}",
+    )
+
+
+def _search_patterns(query):
+    """One prefix pattern per word of query, as storage.search_notes splits it"""
+    return [
+        re.compile(r"(?<!\w)" + re.escape(term))
+        for term in storage._SEARCH_TERM_RE.findall(query.lower())
+    ]
+
+
+def _note_matches(note, patterns):
+    """True if every pattern starts a word in the note's title, text or tags
+
+    Mirrors storage.search_notes, so notes saved or filtered in memory
+    agree with what the full-text search returned.
+    """
+    return bool(patterns) and all(
+        p.search(note.title_lc) or p.search(note.text_lc) or p.search(note.tags_lc)
+        for p in patterns
+    )
+
+
+class _NullIndicator:
+    """Stands in for the AutosaveIndicator until the notes tab is built"""
+
+    def show_saving(self):
+        pass
+
+    def show_saved(self):
+        pass
+
+    def show_error(self, error_msg=""):
+        pass
+
+
+# How many of the most recent notes the notes list shows
+_NOTES_LIST_LIMIT = 200
+
+# Characters not allowed in file names on Windows/macOS
+_FILENAME_BAD_RE = re.compile(r'[<>:"/\\|?*]')
+
+
+@functools.lru_cache(maxsize=1)
+def _pdf_styles():
+    """Title and body ParagraphStyles for PDF export (built on first export)"""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_LEFT
+
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        "CustomTitle",
+        parent=styles["Heading1"],
+        fontSize=24,
+        textColor="#2c3e50",
+        spaceAfter=30,
+    )
+    content_style = ParagraphStyle(
+        "CustomBody",
+        parent=styles["BodyText"],
+        fontSize=12,
+        leading=16,
+        alignment=TA_LEFT,
+    )
+    return title_style, content_style
+
+
+def _write_pdf(filename, title, content):
+    """Render a note to a PDF file; returns filename (runs off the Tk thread)"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    title_style, content_style = _pdf_styles()
+    story = [Paragraph(title, title_style), Spacer(1, 0.2 * inch)]
+
+    # Split content into paragraphs
+    for para in content.split("\n\n"):
+        if para.strip():
+            story.append(Paragraph(para.replace("\n", "<br/>"), content_style))
+            story.append(Spacer(1, 0.15 * inch))
+
+    SimpleDocTemplate(filename, pagesize=letter).build(story)
+    return filename
+
+
+def _ignore_event(fn, result=None):
+    """Adapt a no-argument callable to a Tk event handler returning result"""
+
+    def handler(event):
+        fn()
+        return result
+
+    return handler
+
+
+def _set_label_text(label, text):
+    """Configure label only if its text actually changes"""
+    if label.cget("text") != text:
+        label.config(text=text)
+
+
+def _set_listbox_rows(listbox, rows, shown):
+    """Replace listbox contents with rows unless they match shown; returns rows"""
+    if rows != shown:
+        listbox.delete(0, tk.END)
+        if rows:
+            listbox.insert(tk.END, *rows)
+    return rows
+
+
+def _quiz_from_notes(num_questions=5):
+    """Quiz questions from the recent notes, or a message if there are none"""
+    notes = storage.list_notes(limit=50)  # Get recent notes for context
+    if not notes:
+        return "❌ No notes found.\n\nPlease create some notes first before generating quiz questions."
+
+    # Combine note content to give AI comprehensive context
+    all_notes_text = "".join(
+        f"\n\n=== {note.get('title', '').strip()} ===\n{text}"
+        for note in notes
+        if (text := note.get("text", "").strip())
+    )
+    if not all_notes_text:
+        return "❌ Notes are empty.\n\nPlease add content to your notes before generating quiz questions."
+    return ai_utils.generate_quiz_questions(all_notes_text, num_questions)
+
+
+def _write_note(note_id, title, text, tags, xp):
+    """Update note_id (or create a note if it is None/missing); returns the id"""
+    if note_id is not None:
+        if storage.update_note(note_id, title, text, tags, xp):
+            logger.debug(f"Autosave updated note ID {note_id}: '{title[:30]}...'")
+            return note_id
+        logger.debug(f"Autosave could not find note ID {note_id} - creating it")
+    nid = storage.save_note(title, text, tags, xp=xp)
+    logger.debug(f"Autosave created new note ID {nid}: '{title[:30]}...'")
+    return nid
+
+
+# Reminder date/time picker choices
+_MONTHS = (
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
+)
+_TWO_DIGITS = tuple(f"{i:02d}" for i in range(60))  # "00" .. "59"
+_MONTH_COMBO_VALUES = tuple(f"{_TWO_DIGITS[i]} - {m}" for i, m in enumerate(_MONTHS, 1))
+_DAY_COMBO_VALUES = _TWO_DIGITS[1:32]
+_HOUR_COMBO_VALUES = _TWO_DIGITS[:24]
+_MINUTE_COMBO_VALUES = _TWO_DIGITS[::5]
+
+_NON_BLANK_RE = re.compile(r"\S")
+
+
 def _chunk_text(text, max_chars=3000):
-    paras = [p for p in text.split("\n\n") if p.strip()]
-    chunks, cur = [], ""
-    for p in paras:
-        if len(cur) + len(p) + 2 < max_chars:
-            cur = cur + "\n\n" + p if cur else p
-        else:
-            if cur:
-                chunks.append(cur)
-            cur = p
-    if cur:
-        chunks.append(cur)
+    """Group paragraphs into chunks shorter than max_chars.
+
+    Walks paragraph offsets in one pass and slices each chunk out of text
+    once, instead of building a paragraph list and concatenating strings.
+    """
+    chunks = []
+    start = None  # offset of the current chunk's first paragraph
+    end = 0  # offset just past the current chunk's last paragraph
+    pos = 0
+    while pos <= len(text):
+        nxt = text.find("\n\n", pos)
+        if nxt == -1:
+            nxt = len(text)
+        if _NON_BLANK_RE.search(text, pos, nxt):
+            if start is None:
+                start = pos
+            elif nxt - start >= max_chars:
+                chunks.append(text[start:end])
+                start = pos
+            end = nxt
+        pos = nxt + 2
+    if start is not None:
+        chunks.append(text[start:end])
     return chunks
 
 
 # --- Gemini summarization support ---
-try:
-    import google.generativeai as genai
-
-    GENAI_AVAILABLE = True
-except Exception:
-    genai = None
-    GENAI_AVAILABLE = False
-
-# GEMINI_API_KEY
+# GEMINI_API_KEY - the shared client itself is configured once in ai_utils
 GEMINI_KEY = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-if GEMINI_KEY and GENAI_AVAILABLE:
-    try:
-        genai.configure(api_key=GEMINI_KEY)
-        print(f"✓ Gemini API configured successfully")
-    except Exception as e:
-        print(f"✗ Gemini API configuration failed: {e}")
 
 
-def gemini_summarize(text, max_sentences=6):
-    """Summarize text using Gemini API with better error handling."""
+async def _stream_summary(text, max_sentences, on_chunk):
+    """Summarize text, handing each streamed piece to on_chunk as it arrives"""
+    stream = ai_utils.summarize_text_stream(text, max_sentences)
+    parts = []
+    while True:
+        # The SDK stream is blocking; pull each piece off the event loop
+        piece = await asyncio.to_thread(next, stream, None)
+        if piece is None:
+            break
+        parts.append(piece)
+        on_chunk(piece)
+    return "".join(parts).strip()
+
+
+async def gemini_summarize(text, max_sentences=6, max_chars=3000, on_chunk=None):
+    """Summarize text using Gemini API; long text is summarized in chunks.
+
+    Notes longer than max_chars are split with _chunk_text, the chunks are
+    summarized concurrently and the partial summaries are combined in one
+    final pass. If on_chunk is given, the final pass is streamed to it.
+    Runs on the ai_utils event loop (see ai_utils.run_async).
+    """
     if not text or not text.strip():
         return "No text to summarize."
 
     if not GEMINI_KEY:
         return "Error: GEMINI_API_KEY not found in .env file"
 
-    if not GENAI_AVAILABLE:
+    if not ai_utils.GENAI_AVAILABLE:
         return "Error: google-generativeai package not installed"
 
-    # Try multiple model names in order of preference
-    model_names = [
-        "gemini-2.5-flash",
-        "gemini-flash-latest",
-        "gemini-pro-latest",
-        "gemini-2.0-flash-exp",
-    ]
-
-    for model_name in model_names:
-        try:
-            model = genai.GenerativeModel(model_name)
-
-            prompt = f"""Please summarize the following text concisely in {max_sentences} bullet points or less. 
-Make it clear and informative. End with a brief TL;DR.
-
-Text to summarize:
-{text[:10000]}"""
-
-            print(f"Trying model: {model_name}...")
-            response = model.generate_content(prompt)
-
-            # Better response handling
-            if response and hasattr(response, "text") and response.text:
-                summary = response.text.strip()
-                print(f"✓ Success with {model_name} ({len(summary)} chars)")
-                return summary
-            elif response and hasattr(response, "candidates"):
-                # Try to extract text from candidates
-                for candidate in response.candidates:
-                    if hasattr(candidate, "content") and hasattr(
-                        candidate.content, "parts"
-                    ):
-                        for part in candidate.content.parts:
-                            if hasattr(part, "text") and part.text:
-                                summary = part.text.strip()
-                                print(
-                                    f"✓ Success with {model_name} ({len(summary)} chars)"
-                                )
-                                return summary
-
-        except Exception as e:
-            error_str = str(e)
-            print(f"✗ {model_name} failed: {error_str}")
-            # If this is a 404 model not found, try next model
-            if "404" in error_str or "not found" in error_str.lower():
-                continue
-            # For other errors, return immediately
-            return f"Summarization error: {error_str}"
-
-    return "Error: All Gemini models failed. Please check your API key and internet connection."
-
-
-from modules import storage, speech_notes, quizgen, reminders
+    if len(text) <= max_chars:
+        if on_chunk:
+            return await _stream_summary(text, max_sentences, on_chunk)
+        return await ai_utils.asummarize_text(text, max_sentences)
+
+    # Whole-note result; the per-chunk summaries are cached by ai_utils
+    key = make_key("gemini_summarize", text, max_sentences, max_chars)
+    cached = cache.get(key) if config.CACHE_ENABLED else None
+    if cached is not None:
+        logger.info("Long-note summary served from cache")
+        return cached
+
+    chunks = _chunk_text(text, max_chars=max_chars)
+    partials = await ai_utils.summarize_chunks(chunks, max_sentences)
+    partials = [p for p in partials if not p.startswith(("Error", "Summarization error"))]
+    if not partials:
+        return "Error: Could not summarize any part of the text"
+    if len(partials) == 1:
+        summary = partials[0]
+    elif on_chunk:
+        # Reduce: one summary of the chunk summaries, streamed as it is written
+        summary = await _stream_summary("\n\n".join(partials), max_sentences, on_chunk)
+    else:
+        # Reduce: one summary of the chunk summaries
+        summary = await ai_utils.asummarize_text("\n\n".join(partials), max_sentences)
+
+    if config.CACHE_ENABLED and not summary.startswith(("Error", "Summarization error")):
+        cache.set(key, summary)
+    return summary
+
+
+from modules import storage, reminders, quizgen
 
 storage.ensure_files()
 
@@ -173,21 +395,25 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         # Set minimum window size
         self.minsize(1000, 700)
 
-        self.timer_thread = None
-        self.timer_stop_event = None
-        self.current_timer_seconds = 0
+        # Study timer state (driven by after() on the Tk thread)
+        self._timer_end = 0.0  # time.monotonic() deadline
+        self._timer_minutes = 0
+        self._timer_running = False
+        self._next_tick = None
 
         # Autosave and modification tracking
         self.autosave_timer = None
+        self.autosave_enabled = False
         self.is_modified = False
+        self._last_saved_hash = None  # editor contents at the last save/load
+        self._refresh_pending = False
         
         # Track currently loaded note to prevent duplicates
         self.current_note_id = None  # ID of note currently in editor
+        self._lazy_fill_id = None  # pending after() while a large note loads
 
-        # Undo/Redo stacks for notes
-        self.undo_stack = []
-        self.redo_stack = []
-        self.last_saved_state = ""
+        # Highest N in "Untitled note #N" titles (read from storage on first use)
+        self._max_untitled_idx = None
 
         # Theme tracking
         self.current_theme = "light"  # Start with light theme
@@ -195,6 +421,31 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         # status var used for lightweight toasts instead of blocking dialogs
         self.status_var = tk.StringVar(value="")
 
+        # Blocking AI/voice calls share a small thread pool; note file writes
+        # run in order on one worker thread. Results return to Tk via after()
+        self._ai_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ai")
+        atexit.register(self._ai_pool.shutdown, wait=False, cancel_futures=True)
+        self._io_jobs = queue.Queue()
+        threading.Thread(
+            target=self._job_worker, args=(self._io_jobs, "Storage"), daemon=True
+        ).start()
+        self._editor_gen = 0  # bumped whenever the editor switches notes
+        self._spinner = None  # shared LoadingSpinner, created on first use
+        self._spinner_users = 0
+        self._mod_pending = False  # editor change waiting for the idle flush
+        self._mod_echo = False  # next <<Modified>> comes from our own reset
+        self.autosave_indicator = _NullIndicator()  # replaced in build_notes_tab
+        self._autosave_inflight = False
+        self._closed = False  # set in on_closing; workers stop calling back
+
+        # Widgets that refresh methods may run before (lazy tabs, early callbacks)
+        self.header_stats = None
+        self.notes_count_label = None
+        self.notes_listbox = None
+        self.txt_content = None
+        self.lb_rem = None
+        self.reminder_count_label = None
+
         logger.info("Creating widgets...")
         self.create_widgets()
 
@@ -210,9 +461,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
         # Initial refresh
-        self.refresh_notes()
-        self.refresh_reminders()
-        self.refresh_dashboard()
+        self.refresh_all()
 
     # ---------------- UI creation ----------------
     def create_widgets(self):
@@ -313,11 +562,37 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         nb.add(tab_dash, text="📊 Dashboard")
 
         self.build_notes_tab(tab_notes)
-        self.build_reminders_tab(tab_rem)
-        self.build_quiz_tab(tab_quiz)
         self.build_timer_tab(tab_timer)
         self.build_dashboard_tab(tab_dash)
 
+        # Rarely visited tabs are built the first time they are opened
+        self._lazy_tabs = {
+            str(tab_rem): (self.build_reminders_tab, tab_rem, self.refresh_reminders),
+            str(tab_quiz): (self.build_quiz_tab, tab_quiz, None),
+        }
+        nb.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+    def _on_tab_changed(self, event):
+        """Build a lazy tab on its first visit"""
+        entry = self._lazy_tabs.pop(event.widget.select(), None)
+        if entry is None:
+            return
+        build, parent, on_built = entry
+        steps = build(parent)
+        if steps is None:
+            return  # plain builder - already done
+        self._hydrate_tab(steps, on_built)
+
+    def _hydrate_tab(self, steps, on_built):
+        """Run one section of a generator-based tab builder per event-loop turn"""
+        try:
+            next(steps)
+        except StopIteration:
+            if on_built:
+                on_built()
+            return
+        self.after(0, self._hydrate_tab, steps, on_built)
+
     # ---------------- Notes Tab ----------------
     def build_notes_tab(self, parent):
         # Use a PanedWindow so the notes list is resizable by the user
@@ -347,7 +622,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         search_frame.pack(fill="x", pady=(0, 10))
         
         self.search_var = tk.StringVar()
-        self.search_var.trace("w", lambda *args: self.filter_notes_live())
+        self.search_var.trace("w", self._on_search_changed)
         
         self.search_entry = ttk.Entry(
             search_frame, 
@@ -408,6 +683,11 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         # Store note objects for reference
         self.notes = []
         self.filtered_notes = []
+        self._displayed_ids = None  # note ids currently shown (None = placeholder)
+        self._search_after_id = None
+        self._last_query = None  # query behind filtered_notes (None = unfiltered list)
+        self._notes_version = 0  # bumped whenever self.notes changes
+        self._filter_cache = {}  # (query, notes version) -> filtered notes
 
         # Button panel with ttkbootstrap styled buttons
         btns = ttk.Frame(left)
@@ -487,8 +767,15 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         self.autosave_indicator = AutosaveIndicator(content_header)
         self.autosave_indicator.pack(side="right", padx=(12, 0))
 
-        self.txt_content = scrolledtext.ScrolledText(
-            editor_frame, height=18, font=("Segoe UI", 15), wrap="word"
+        # Undo/redo is Tk's own (stored as diffs in C, capped at 50 steps)
+        self.txt_content = TrackedText(
+            editor_frame,
+            height=18,
+            font=("Segoe UI", 15),
+            wrap="word",
+            undo=True,
+            maxundo=50,
+            autoseparators=True,
         )
         self.txt_content.pack(fill="both", expand=True, pady=(0, 10))
 
@@ -552,9 +839,22 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
                 action_frame, text="✍️ Rewrite Text", command=self.show_rewrite_menu
             ).pack(side="left")
 
-    def refresh_notes(self):
+    def refresh_all(self, records=None):
+        """Refresh the notes list, reminders and dashboard from one notes read"""
+        if records is None:
+            try:
+                records = storage.list_notes(limit=_NOTES_LIST_LIMIT)
+            except Exception as e:
+                # Leave records as None so each panel retries and reports it
+                logger.error(f"Failed to load notes: {e}")
+        self.refresh_notes(records)
+        self.refresh_reminders()
+        self.refresh_dashboard(records)
+
+    def refresh_notes(self, records=None):
         """Populate the notes listbox with all available notes.
         Simple and reliable - just clears and rebuilds the list.
+        records: notes already read from storage.list_notes (read here if None)
         """
         try:
             logger.info("Refreshing notes list...")
@@ -563,48 +863,33 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             self.notes_listbox.delete(0, tk.END)
             
             # Load notes from storage
-            self.notes = storage.list_notes(limit=200)
+            if records is None:
+                records = storage.list_notes(limit=_NOTES_LIST_LIMIT)
+            self.notes = [_to_note(r) for r in records]
+            self._notes_changed()
             self.filtered_notes = self.notes.copy()  # Keep a copy for filtering
+            self._last_query = None
             
             logger.info(f"Loaded {len(self.notes)} notes from storage")
             
             # Update count label
-            if hasattr(self, 'notes_count_label'):
+            if self.notes_count_label is not None:
                 self.notes_count_label.config(text=f"({len(self.notes)})")
             
             if not self.notes:
                 logger.warning("No notes found in storage")
+                self._displayed_ids = None
                 self.notes_listbox.insert(tk.END, "📭 No notes yet - click New to create one!")
                 return
             
-            # Add each note to the listbox with a formatted display
-            for note in self.notes:
-                try:
-                    nid = note.get("id")
-                    title = note.get("title", "").strip() or f"Untitled #{nid}"
-                    raw_date = note.get("datetime", "")
-                    
-                    # Format date
-                    try:
-                        dt = datetime.fromisoformat(raw_date)
-                        display_date = dt.strftime("%b %d, %Y")
-                    except Exception:
-                        display_date = "No date"
-                    
-                    # Create display text: "📄 Title - Date"
-                    display_text = f"📄 {title} - {display_date}"
-                    
-                    # Insert into listbox
-                    self.notes_listbox.insert(tk.END, display_text)
-                    
-                except Exception as e:
-                    logger.error(f"Failed to display note {note.get('id', '?')}: {e}")
-                    continue
+            # Insert all rows in a single Tk call
+            self.notes_listbox.insert(tk.END, *(n.display for n in self.notes))
+            self._displayed_ids = [n.id for n in self.notes]
             
             logger.info(f"Successfully displayed {len(self.notes)} notes in listbox")
             
             # Update header stats
-            if hasattr(self, 'header_stats'):
+            if self.header_stats is not None:
                 self.header_stats.config(text=f"📊 {len(self.notes)} Notes")
             
         except Exception as e:
@@ -618,10 +903,20 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
                 "• Missing data directory"
             )
 
+    def _on_search_changed(self, *args):
+        """Debounce the search box: filter once typing pauses for 150 ms"""
+        if self._search_after_id:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(150, self._run_search)
+
+    def _run_search(self):
+        self._search_after_id = None
+        self.filter_notes_live()
+
     def filter_notes_live(self):
         """Live filter notes as user types in search box"""
         # Safety check: ensure listbox exists before filtering
-        if not hasattr(self, 'notes_listbox'):
+        if self.notes_listbox is None:
             return
         
         query = self.search_var.get().strip().lower()
@@ -630,48 +925,64 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         if query.startswith("🔍") or query == self.search_placeholder.lower():
             query = ""
         
-        # Clear listbox
-        self.notes_listbox.delete(0, tk.END)
+        # Same query as the list already shows - nothing to do
+        if query == self._last_query:
+            return
         
-        # Filter notes
-        if not query:
+        # Filter notes (reusing the result if this query ran on the same notes)
+        key = (query, self._notes_version)
+        cached = self._filter_cache.get(key)
+        if cached is not None:
+            self.filtered_notes = cached
+        elif not query:
             # Show all notes
             self.filtered_notes = self.notes.copy()
         else:
-            # Filter by title or content
-            self.filtered_notes = [
-                n for n in self.notes
-                if query in n.get("title", "").lower() 
-                or query in n.get("text", "").lower()
-            ]
+            # Full-text search in storage (matches title, content and tags)
+            try:
+                self.filtered_notes = [
+                    _to_note(r) for r in storage.search_notes(query, limit=_NOTES_LIST_LIMIT)
+                ]
+            except Exception as e:
+                logger.error(f"Note search failed, filtering loaded notes: {e}")
+                patterns = _search_patterns(query)
+                self.filtered_notes = [n for n in self.notes if _note_matches(n, patterns)]
+        if cached is None:
+            if len(self._filter_cache) >= 32:
+                del self._filter_cache[next(iter(self._filter_cache))]
+            self._filter_cache[key] = self.filtered_notes
+        self._last_query = query
         
         # Update count
-        if hasattr(self, 'notes_count_label'):
+        if self.notes_count_label is not None:
             self.notes_count_label.config(
                 text=f"({len(self.filtered_notes)}/{len(self.notes)})"
             )
         
         # Display filtered notes
         if not self.filtered_notes:
+            self.notes_listbox.delete(0, tk.END)
             self.notes_listbox.insert(tk.END, "🔍 No matching notes found")
+            self._displayed_ids = None
             return
         
-        for note in self.filtered_notes:
-            try:
-                nid = note.get("id")
-                title = note.get("title", "").strip() or f"Untitled #{nid}"
-                raw_date = note.get("datetime", "")
-                
-                try:
-                    dt = datetime.fromisoformat(raw_date)
-                    display_date = dt.strftime("%b %d, %Y")
-                except Exception:
-                    display_date = "No date"
-                
-                display_text = f"📄 {title} - {display_date}"
-                self.notes_listbox.insert(tk.END, display_text)
-            except Exception as e:
-                logger.error(f"Error displaying filtered note: {e}")
+        # Keep the rows shared with what is already shown; redraw only the rest
+        new_ids = [n.id for n in self.filtered_notes]
+        old_ids = self._displayed_ids
+        keep = 0
+        if old_ids is None:
+            self.notes_listbox.delete(0, tk.END)
+        else:
+            limit = min(len(old_ids), len(new_ids))
+            while keep < limit and old_ids[keep] == new_ids[keep]:
+                keep += 1
+            if keep < len(old_ids):
+                self.notes_listbox.delete(keep, tk.END)
+        if keep < len(new_ids):
+            self.notes_listbox.insert(
+                tk.END, *(n.display for n in self.filtered_notes[keep:])
+            )
+        self._displayed_ids = new_ids
 
     def on_note_select(self, event):
         """Handle selection from the listbox and populate the editor fields."""
@@ -690,47 +1001,103 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         note = self.filtered_notes[idx]
         
         # IMPORTANT: Track the currently loaded note ID
-        self.current_note_id = note.get("id")
+        self.current_note_id = note.id
+        self._editor_gen += 1
         
         # Populate editor fields
         self.entry_title.delete(0, tk.END)
-        self.entry_title.insert(0, note.get("title", ""))
+        self.entry_title.insert(0, note.title)
         
+        self._cancel_lazy_fill()
         self.txt_content.delete("1.0", tk.END)
-        self.txt_content.insert(tk.END, note.get("text", ""))
+        text = note.text
+        if len(text) < config.LAZY_LOAD_THRESHOLD:
+            self.txt_content.insert(tk.END, text)
+        else:
+            # Show the first screenful now; the rest loads in slices
+            self.txt_content.insert(tk.END, text[: config.LAZY_LOAD_FIRST])
+            self.txt_content.config(state="disabled")
+            self._lazy_fill_id = self.after(
+                1, self._lazy_fill_remaining, text, config.LAZY_LOAD_FIRST
+            )
         
         self.entry_tags.delete(0, tk.END)
-        self.entry_tags.insert(0, note.get("tags", ""))
+        self.entry_tags.insert(0, note.tags)
         
         # Reset modified flag since we just loaded
         self.is_modified = False
-        
-        logger.info(f"Loaded note ID {self.current_note_id}: {note.get('title', 'Untitled')}")
-
-    def new_note(self):
+        if self._lazy_fill_id is None:
+            self._last_saved_hash = self._editor_hash()
+            self.txt_content.edit_reset()
+        
+        logger.info(f"Loaded note ID {self.current_note_id}: {note.title or 'Untitled'}")
+
+    def _lazy_fill_remaining(self, text, offset):
+        """Insert the next slice of a large note into the editor"""
+        end = offset + config.LAZY_LOAD_CHUNK
+        self.txt_content.config(state="normal")
+        self.txt_content.insert(tk.END, text[offset:end])
+        self.txt_content.edit_modified(False)
+        if end < len(text):
+            self.txt_content.config(state="disabled")
+            self._lazy_fill_id = self.after(1, self._lazy_fill_remaining, text, end)
+            return
+        self._lazy_fill_id = None
+        self.is_modified = False
+        self._last_saved_hash = self._editor_hash()
+        self.txt_content.edit_reset()
+
+    def _cancel_lazy_fill(self):
+        """Stop loading the rest of a large note"""
+        if self._lazy_fill_id:
+            self.after_cancel(self._lazy_fill_id)
+            self._lazy_fill_id = None
+            self.txt_content.config(state="normal")
+
+    def _reset_editor(self, title="", text="", tags=""):
+        """Load title/text/tags into the editor as unmodified, in one pass"""
+        self._cancel_lazy_fill()
         self.entry_title.delete(0, tk.END)
         self.txt_content.delete("1.0", tk.END)
         self.entry_tags.delete(0, tk.END)
+        if title:
+            self.entry_title.insert(0, title)
+        if text:
+            self.txt_content.insert("1.0", text)
+        if tags:
+            self.entry_tags.insert(0, tags)
+        self.txt_content.edit_reset()
+        self._editor_gen += 1
+        self.is_modified = False
+        self._last_saved_hash = self._editor_hash()
+        self.autosave_indicator.show_saved()
+        self.update_idletasks()
+
+    def new_note(self):
+        self._reset_editor()
         # Clear current note ID to indicate this is a new note
         self.current_note_id = None
-        self.is_modified = False
         logger.info("New note started - cleared current note ID")
 
+    def _next_untitled_title(self):
+        """Reserve the next "Untitled note #N" title"""
+        if self._max_untitled_idx is None:
+            self._max_untitled_idx = storage.get_max_untitled_index()
+        self._max_untitled_idx += 1
+        return f"Untitled note #{self._max_untitled_idx}"
+
     def save_note(self):
+        if self._lazy_fill_id:
+            return  # editor holds only part of a large note
+        if self._autosave_inflight:
+            # Let the pending autosave report the note id first
+            self.after(50, self.save_note)
+            return
         # determine title; if blank, auto-name as "Untitled note #N"
         title = self.entry_title.get().strip()
         if not title:
-            notes_list = storage.list_notes(limit=9999)
-            untitled_nums = []
-            for n in notes_list:
-                t = n.get("title") or ""
-                if t.startswith("Untitled note #"):
-                    parts = t.split("#")[-1]
-                    if parts.isdigit():
-                        untitled_nums.append(int(parts))
-            next_idx = max(untitled_nums) + 1 if untitled_nums else 1
-            title = f"Untitled note #{next_idx}"
-        text = self.txt_content.get("1.0", tk.END).strip()
+            title = self._next_untitled_title()
+        text = self.txt_content.contents().strip()
         tags = self.entry_tags.get().strip()
         if not text:
             messagebox.showwarning("Empty", "Please enter some content")
@@ -759,16 +1126,109 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         
         self.after(2500, lambda: self.status_var.set(""))
         self.is_modified = False  # Reset modification flag
-        if hasattr(self, "autosave_indicator"):
-            self.autosave_indicator.show_saved()
-        self.refresh_notes()
+        self._last_saved_hash = self._editor_hash()
+        self.autosave_indicator.show_saved()
+        self._upsert_note_row(
+            _to_note(
+                {
+                    "id": self.current_note_id,
+                    "title": title,
+                    "text": text,
+                    "tags": tags,
+                    "datetime": datetime.now().isoformat(),
+                    "xp": xp,
+                }
+            )
+        )
+        self._schedule_refresh()
+
+    def _notes_changed(self):
+        """Invalidate cached search results after self.notes changes"""
+        self._notes_version += 1
+        self._filter_cache.clear()
+
+    def _upsert_note_row(self, note):
+        """Show a just-saved note at the top of the list without reloading storage"""
+        self._notes_changed()
+        old_idx = next((i for i, n in enumerate(self.notes) if n.id == note.id), None)
+        if old_idx is not None:
+            del self.notes[old_idx]
+        self.notes.insert(0, note)
+
+        if self._displayed_ids is None:
+            # A placeholder message is showing; clear it first
+            self.notes_listbox.delete(0, tk.END)
+            self.filtered_notes, self._displayed_ids = [], []
+        if note.id in self._displayed_ids:
+            idx = self._displayed_ids.index(note.id)
+            del self.filtered_notes[idx], self._displayed_ids[idx]
+            self.notes_listbox.delete(idx)
+        query = self._last_query
+        if not query or _note_matches(note, _search_patterns(query)):
+            self.filtered_notes.insert(0, note)
+            self._displayed_ids.insert(0, note.id)
+            self.notes_listbox.insert(0, note.display)
+        elif not self.filtered_notes:
+            self.notes_listbox.delete(0, tk.END)
+            self.notes_listbox.insert(tk.END, "🔍 No matching notes found")
+            self._displayed_ids = None
+
+        if self.notes_count_label is not None:
+            if query:
+                count = f"({len(self.filtered_notes)}/{len(self.notes)})"
+            else:
+                count = f"({len(self.notes)})"
+            self.notes_count_label.config(text=count)
+
+    def _remove_note_row(self, nid):
+        """Drop a deleted note from the list without reloading storage"""
+        self._notes_changed()
+        self.notes = [n for n in self.notes if n.id != nid]
+        if self._displayed_ids and nid in self._displayed_ids:
+            idx = self._displayed_ids.index(nid)
+            del self.filtered_notes[idx], self._displayed_ids[idx]
+            self.notes_listbox.delete(idx)
+
+        if not self.notes:
+            self.notes_listbox.delete(0, tk.END)
+            self.notes_listbox.insert(tk.END, "📭 No notes yet - click New to create one!")
+            self._displayed_ids = None
+        elif self._displayed_ids == []:
+            self.notes_listbox.insert(tk.END, "🔍 No matching notes found")
+            self._displayed_ids = None
+
+        if self.notes_count_label is not None:
+            if self._last_query:
+                count = f"({len(self.filtered_notes)}/{len(self.notes)})"
+            else:
+                count = f"({len(self.notes)})"
+            self.notes_count_label.config(text=count)
+        if self.header_stats is not None:
+            self.header_stats.config(text=f"📊 {len(self.notes)} Notes")
+
+    def _schedule_refresh(self):
+        """Refresh the dashboard once, shortly after saves settle"""
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        self.after(250, self._do_coalesced_refresh)
+
+    def _do_coalesced_refresh(self):
+        self._refresh_pending = False
         self.refresh_dashboard()
 
     def save_note_silent(self):
         """Autosave without showing message"""
+        if self._lazy_fill_id:
+            return  # editor holds only part of a large note
+        if self._autosave_inflight:
+            # A new note's id is not known until the pending write returns
+            if self.autosave_enabled:
+                self._schedule_autosave()
+            return
         try:
             title = self.entry_title.get().strip()
-            text = self.txt_content.get("1.0", tk.END).strip()
+            text = self.txt_content.contents().strip()
             
             # Don't save if text is empty or too short (prevents empty note creation)
             if not text or len(text) < 3:
@@ -781,100 +1241,103 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
                 return
 
             if not title:
-                notes_list = storage.list_notes(limit=9999)
-                untitled_nums = []
-                for n in notes_list:
-                    t = n.get("title") or ""
-                    if t.startswith("Untitled note #"):
-                        parts = t.split("#")[-1]
-                        if parts.isdigit():
-                            untitled_nums.append(int(parts))
-                next_idx = max(untitled_nums) + 1 if untitled_nums else 1
-                title = f"Untitled note #{next_idx}"
+                title = self._next_untitled_title()
 
             tags = self.entry_tags.get().strip()
             xp = 5 + min(50, len(text) // 20)
-            
-            # Check if editing existing note or creating new
-            if self.current_note_id is not None:
-                # UPDATE existing note
-                success = storage.update_note(self.current_note_id, title, text, tags, xp)
-                if success:
-                    logger.debug(f"Autosave updated note ID {self.current_note_id}: '{title[:30]}...'")
-                else:
-                    # Note not found, create new
-                    nid = storage.save_note(title, text, tags, xp=xp)
-                    self.current_note_id = nid
-                    logger.debug(f"Autosave created new note ID {nid} (original not found)")
-            else:
-                # CREATE new note
-                nid = storage.save_note(title, text, tags, xp=xp)
-                self.current_note_id = nid
-                logger.debug(f"Autosave created new note ID {nid}: '{title[:30]}...'")
-
-            self.is_modified = False
-            if hasattr(self, "autosave_indicator"):
-                self.autosave_indicator.show_saved()
         except Exception as e:
             logger.error(f"Autosave failed: {e}")
-            if hasattr(self, "autosave_indicator"):
-                self.autosave_indicator.show_error()
+            self.autosave_indicator.show_error()
+            return
+
+        # Widgets are read here; the CSV write happens on the storage worker
+        self._autosave_inflight = True
+        self.submit_io_job(
+            _write_note,
+            self.current_note_id,
+            title,
+            text,
+            tags,
+            xp,
+            callback=functools.partial(
+                self._on_autosaved, self._editor_gen, self._editor_hash()
+            ),
+        )
+
+    def _on_autosaved(self, gen, saved_hash, nid, error):
+        """Apply a finished autosave (runs on the Tk thread)"""
+        self._autosave_inflight = False
+        if error is not None:
+            self.autosave_indicator.show_error()
+            return
+        if gen != self._editor_gen:
+            return  # editor has moved on to another note
+        self.current_note_id = nid
+        self._last_saved_hash = saved_hash
+        if self._editor_hash() != saved_hash:
+            return  # typed more while saving - the next autosave picks it up
+        self.is_modified = False
+        # Start a new undo group so undo stops at the autosaved text
+        self.txt_content.edit_separator()
+        self.autosave_indicator.show_saved()
 
     def mark_modified(self, *args):
-        """Mark content as modified"""
+        """Mark content as modified and (re)start the autosave countdown"""
         self.is_modified = True
-        if hasattr(self, "autosave_indicator"):
-            self.autosave_indicator.show_saving()
+        self.autosave_indicator.show_saving()
+        if self.autosave_enabled:
+            self._schedule_autosave()
 
     def _on_text_modified(self, event=None):
         """Handle text widget modification event"""
-        # Clear the modified flag to prevent repeated triggers
+        if self._mod_echo:
+            # Raised by our own edit_modified(False) - the flag is already clear
+            self._mod_echo = False
+            return
+        if self._lazy_fill_id:
+            # Inserts from a large note still loading are not user edits
+            self.txt_content.edit_modified(False)
+            return
+        # Handle the edit once the UI is idle; keys typed meanwhile leave the
+        # flag set and raise no further events
+        if not self._mod_pending and self.txt_content.edit_modified():
+            self._mod_pending = True
+            self.after_idle(self._flush_modification)
+
+    def _flush_modification(self):
+        """Clear the modified flag and mark the note dirty (idle callback)"""
+        self._mod_pending = False
         if self.txt_content.edit_modified():
-            # Save current state to undo stack
-            current_text = self.txt_content.get("1.0", tk.END)
-            if current_text != self.last_saved_state:
-                if len(self.undo_stack) == 0 or self.undo_stack[-1] != current_text:
-                    self.undo_stack.append(self.last_saved_state)
-                    # Limit undo stack size
-                    if len(self.undo_stack) > 50:
-                        self.undo_stack.pop(0)
-                self.last_saved_state = current_text
-            self.mark_modified()
+            self._mod_echo = True
             self.txt_content.edit_modified(False)
+            self.mark_modified()
+
+    def _replace_editor_text(self, text):
+        """Replace the editor contents as a single undo step"""
+        self.txt_content.edit_separator()
+        self.txt_content.config(autoseparators=False)
+        try:
+            self.txt_content.delete("1.0", tk.END)
+            self.txt_content.insert("1.0", text)
+        finally:
+            self.txt_content.config(autoseparators=True)
+        self.txt_content.edit_separator()
 
     def undo_note(self):
         """Undo the last change in the note editor"""
-        if not self.undo_stack:
+        try:
+            self.txt_content.edit_undo()
+            logger.info("Undo performed")
+        except tk.TclError:
             logger.info("Nothing to undo")
-            return
-
-        # Save current state to redo stack
-        current_text = self.txt_content.get("1.0", tk.END)
-        self.redo_stack.append(current_text)
-
-        # Restore previous state
-        previous_state = self.undo_stack.pop()
-        self.txt_content.delete("1.0", tk.END)
-        self.txt_content.insert("1.0", previous_state)
-        self.last_saved_state = previous_state
-        logger.info("Undo performed")
 
     def redo_note(self):
         """Redo the last undone change"""
-        if not self.redo_stack:
+        try:
+            self.txt_content.edit_redo()
+            logger.info("Redo performed")
+        except tk.TclError:
             logger.info("Nothing to redo")
-            return
-
-        # Save current state to undo stack
-        current_text = self.txt_content.get("1.0", tk.END)
-        self.undo_stack.append(current_text)
-
-        # Restore next state
-        next_state = self.redo_stack.pop()
-        self.txt_content.delete("1.0", tk.END)
-        self.txt_content.insert("1.0", next_state)
-        self.last_saved_state = next_state
-        logger.info("Redo performed")
 
     def delete_selected_note(self):
         """Delete the currently selected note from the listbox"""
@@ -895,8 +1358,8 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         
         # Get the note to delete
         note = self.filtered_notes[idx]
-        nid = note.get("id")
-        note_title = note.get("title", "Untitled")
+        nid = note.id
+        note_title = note.title or "Untitled"
         
         logger.info(f"Deleting note ID: {nid}, Title: {note_title}")
         
@@ -905,20 +1368,14 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         logger.info("Autosave timer stopped")
         
         # Store original note data in case user cancels
-        original_title = note.get("title", "")
-        original_text = note.get("text", "")
-        original_tags = note.get("tags", "")
+        original_title = note.title
+        original_text = note.text
+        original_tags = note.tags
         
         # CRITICAL: Clear the editor fields BEFORE showing the confirmation dialog
         # This prevents autosave from re-saving the note while the dialog is open
-        self.entry_title.delete(0, tk.END)
-        self.txt_content.delete("1.0", tk.END)
-        self.entry_tags.delete(0, tk.END)
-        
-        # Reset modification flag to prevent autosave
-        self.is_modified = False
-        if hasattr(self, "autosave_indicator"):
-            self.autosave_indicator.show_saved()
+        # (the editor is also marked unmodified)
+        self._reset_editor()
         
         logger.info("Editor cleared before deletion to prevent autosave resurrection")
 
@@ -931,23 +1388,26 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         if not ok:
             logger.info("Delete cancelled by user - restoring note to editor")
             # Reload the note if user cancels using stored data
-            self.entry_title.insert(0, original_title)
-            self.txt_content.insert(tk.END, original_text)
-            self.entry_tags.insert(0, original_tags)
+            self._reset_editor(original_title, original_text, original_tags)
             # Restart autosave timer
             self.start_autosave_timer()
             logger.info("Autosave timer restarted after cancel")
             return
 
-        try:
-            logger.info(f"Calling storage.delete_note({nid})")
-            removed = storage.delete_note(nid)
-            logger.info(f"Delete result: {removed}")
-        except Exception as e:
-            logger.error(f"Exception during delete: {e}", exc_info=True)
+        logger.info(f"Calling storage.delete_note({nid})")
+        self.submit_io_job(
+            storage.delete_note,
+            nid,
+            callback=functools.partial(self._on_note_deleted, nid, note_title),
+        )
+
+    def _on_note_deleted(self, nid, note_title, removed, error):
+        """Report the result of a background delete (runs on the Tk thread)"""
+        if error is not None:
+            logger.error(f"Exception during delete: {error}")
             messagebox.showerror(
                 "🗑️ Delete Error", 
-                f"Could not delete the note:\n{e}\n\n"
+                f"Could not delete the note:\n{error}\n\n"
                 "Possible causes:\n"
                 "• Database access issue\n"
                 "• File permissions problem\n"
@@ -958,14 +1418,16 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             logger.info("Autosave timer restarted after error")
             return
 
+        logger.info(f"Delete result: {removed}")
         if removed:
             logger.info(f"Successfully deleted note {nid}")
             self.status_var.set(f"✓ Note '{note_title}' deleted")
             self.after(3000, lambda: self.status_var.set(""))
             # Clear current note ID since note was deleted
-            self.current_note_id = None
-            self.refresh_notes()
-            self.refresh_dashboard()
+            if self.current_note_id == nid:
+                self.current_note_id = None
+            self._remove_note_row(nid)
+            self._schedule_refresh()
             # Restart autosave timer after successful deletion
             self.start_autosave_timer()
             logger.info("Autosave timer restarted after successful deletion")
@@ -984,10 +1446,19 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             logger.info("Autosave timer restarted after failed deletion")
 
     def record_note_thread(self):
-        threading.Thread(target=self.record_note, daemon=True).start()
+        self.submit_ai_job(self.record_note, callback=self._on_transcribed)
 
     def record_note(self):
-        res = speech_notes.transcribe_from_microphone()
+        """Record and transcribe from the microphone (runs on the AI pool)"""
+        # Imported on first use - speech_recognition is slow to load
+        from modules import speech_notes
+
+        return speech_notes.transcribe_from_microphone()
+
+    def _on_transcribed(self, res, error):
+        """Put a finished transcription into the editor (runs on the Tk thread)"""
+        if error is not None:
+            res = {"error": str(error)}
         if isinstance(res, dict) and res.get("error"):
             error_msg = res.get("error")
             messagebox.showerror(
@@ -1000,81 +1471,129 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             )
             return
         text = res.get("text") if isinstance(res, dict) else str(res)
-        self.txt_content.delete("1.0", tk.END)
-        self.txt_content.insert(tk.END, text)
+        self._replace_editor_text(text)
         messagebox.showinfo("✅ Transcribed", "Voice note successfully transcribed and added to editor!")
 
     def summarize_selected(self):
         """Generate AI summary using new SummaryModal and ai_utils"""
-        text = self.txt_content.get("1.0", tk.END).strip()
+        text = self.txt_content.contents().strip()
         if not text:
             messagebox.showwarning("No text", "Write or select a note first")
             return
 
         logger.info("Starting AI summary generation")
 
-        # Show loading spinner
-        loading = LoadingSpinner(self, "Generating AI summary...")
-        loading.pack(pady=20)
-        loading.start()
+        # Open the modal right away and fill it as the response streams in
+        modal = SummaryModal(
+            self,
+            title="✨ AI Summary",
+            summary_text="⏳ Generating AI summary...",
+            original_text=text,
+        )
+
+        chunks = queue.Queue()
+        stop_event = threading.Event()
+        received = [False]
 
         def _worker():
             try:
-                summary = ai_utils.summarize_text(text)
-                self.after(0, lambda: _finish_summary(summary))
+                for piece in ai_utils.summarize_text_stream(text):
+                    if stop_event.is_set():
+                        break
+                    chunks.put(piece)
             except Exception as e:
                 logger.error(f"Summary generation failed: {e}")
-                self.after(0, lambda err=e: _finish_summary(None, str(err)))
-
-        def _finish_summary(summary, error=None):
-            loading.stop()
-            loading.destroy()
-
-            if error:
-                messagebox.showerror(
-                    "Summary Error", f"Failed to generate summary:\n{error}"
-                )
+                chunks.put(f"\nFailed to generate summary: {e}")
+            finally:
+                chunks.put(None)
+
+        def _pump():
+            if not modal.winfo_exists():
+                # Modal closed early - stop consuming the stream
+                stop_event.set()
                 return
+            try:
+                while True:
+                    piece = chunks.get_nowait()
+                    if piece is None:
+                        if not received[0]:
+                            modal.set_text("Could not generate summary")
+                        logger.info("Summary generated successfully")
+                        return
+                    if not received[0]:
+                        received[0] = True
+                        modal.set_text(piece)
+                    else:
+                        modal.append_text(piece)
+            except queue.Empty:
+                pass
+            self.after(50, _pump)
+
+        if len(text) > config.LONG_NOTE_CHARS:
+            # Too long for one prompt - summarize chunks concurrently, then
+            # stream the combining pass into the same queue
+            streamed = [False]
+
+            def _on_chunk(piece):
+                streamed[0] = True
+                chunks.put(piece)
+
+            def _done(f):
+                try:
+                    summary = f.result()
+                    if not streamed[0]:
+                        # Cached or single-chunk result arrives in one piece
+                        chunks.put(summary)
+                except Exception as e:
+                    logger.error(f"Summary generation failed: {e}")
+                    chunks.put(f"\nFailed to generate summary: {e}")
+                finally:
+                    chunks.put(None)
 
-            if summary:
-                logger.info("Summary generated successfully")
-                # Use the new SummaryModal
-                modal = SummaryModal(
-                    self,
-                    title="✨ AI Summary",
-                    summary_text=summary,
-                    original_text=text,
-                )
-            else:
-                messagebox.showwarning("No Summary", "Could not generate summary")
-
-        threading.Thread(target=_worker, daemon=True).start()
+            ai_utils.run_async(gemini_summarize(text, on_chunk=_on_chunk)).add_done_callback(
+                _done
+            )
+        else:
+            self._ai_pool.submit(_worker)
+        self.after(50, _pump)
+
+    def _show_spinner(self, text):
+        """Show the shared loading spinner (one per window, reused)"""
+        if self._spinner is None:
+            self._spinner = LoadingSpinner(self, text)
+        self._spinner_users += 1
+        self._spinner.set_text(text)
+        self._spinner.pack(pady=20)
+        self._spinner.start()
+
+    def _hide_spinner(self):
+        """Hide the shared spinner once no AI action is using it"""
+        self._spinner_users = max(0, self._spinner_users - 1)
+        if self._spinner is not None and not self._spinner_users:
+            self._spinner.stop()
+            self._spinner.pack_forget()
 
     def generate_flashcards(self):
         """Generate AI flashcards with flip animation"""
-        text = self.txt_content.get("1.0", tk.END).strip()
+        text = self.txt_content.contents().strip()
         if not text:
             messagebox.showwarning("Empty", "Select a note or write something")
             return
 
         logger.info("Starting flashcard generation")
 
-        # Show loading spinner
-        loading = LoadingSpinner(self, "Generating flashcards...")
-        loading.pack(pady=20)
-        loading.start()
+        self._show_spinner("Generating flashcards...")
 
         def _worker():
             try:
                 flashcards = ai_utils.generate_flashcards(text, num_cards=5)
-                self.after(0, lambda: _show_flashcards(flashcards))
+                self._safe_after(_show_flashcards, flashcards)
             except Exception as e:
                 logger.error(f"Flashcard generation failed: {e}")
-                self.after(0, lambda err=e: _show_flashcards(None, str(err)))
+                self._safe_after(_show_flashcards, None, str(e))
 
         def _show_flashcards(cards, error=None):
-            loading.stop()
-            loading.destroy()
+            self._hide_spinner()
 
             if error:
                 messagebox.showerror(
@@ -1091,7 +1610,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             logger.info(f"Generated {len(cards)} flashcards")
             self._show_flashcard_modal(cards)
 
-        threading.Thread(target=_worker, daemon=True).start()
+        self._ai_pool.submit(_worker)
 
     def _show_flashcard_modal(self, flashcards):
         """Display flashcards in an interactive modal with flip animation"""
@@ -1117,6 +1636,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             height=10,
         )
         card_text.pack(fill="both", expand=True)
+        card_text.tag_config("header", font=(config.FONT_FAMILY, 15, "bold"))
         card_text.config(state="disabled")
 
         # Progress label
@@ -1134,19 +1654,13 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             card = flashcards[idx]
             is_question = showing_question[0]
 
-            # Update card text
-            card_text.config(state="normal")
-            card_text.delete("1.0", tk.END)
-
+            # Update card text in one replace, header tagged as it goes in
             if is_question:
-                card_text.insert("1.0", f"Question:\n\n{card['question']}")
-                card_text.tag_add("header", "1.0", "1.9")
-                card_text.tag_config("header", font=(config.FONT_FAMILY, 15, "bold"))
+                header, body = "Question:", card["question"]
             else:
-                card_text.insert("1.0", f"Answer:\n\n{card['answer']}")
-                card_text.tag_add("header", "1.0", "1.7")
-                card_text.tag_config("header", font=(config.FONT_FAMILY, 15, "bold"))
-
+                header, body = "Answer:", card["answer"]
+            card_text.config(state="normal")
+            card_text.replace("1.0", tk.END, header, "header", f"\n\n{body}")
             card_text.config(state="disabled")
 
             # Update progress
@@ -1205,7 +1719,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
 
     def show_rewrite_menu(self):
         """Show menu with rewrite options"""
-        text = self.txt_content.get("1.0", tk.END).strip()
+        text = self.txt_content.contents().strip()
         if not text:
             messagebox.showwarning("Empty", "Write some text first")
             return
@@ -1252,22 +1766,18 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         menu_modal.destroy()
         logger.info(f"Rewriting text with style: {style}")
 
-        # Show loading spinner
-        loading = LoadingSpinner(self, f"Rewriting text ({style})...")
-        loading.pack(pady=20)
-        loading.start()
+        self._show_spinner(f"Rewriting text ({style})...")
 
         def _worker():
             try:
                 rewritten = ai_utils.rewrite_text(original_text, style)
-                self.after(0, lambda: _finish_rewrite(rewritten))
+                self._safe_after(_finish_rewrite, rewritten)
             except Exception as e:
                 logger.error(f"Rewrite failed: {e}")
-                self.after(0, lambda err=e: _finish_rewrite(None, str(err)))
+                self._safe_after(_finish_rewrite, None, str(e))
 
         def _finish_rewrite(rewritten_text, error=None):
-            loading.stop()
-            loading.destroy()
+            self._hide_spinner()
 
             if error:
                 messagebox.showerror(
@@ -1282,7 +1792,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             logger.info("Text rewritten successfully")
             self._show_rewrite_result(original_text, rewritten_text, style)
 
-        threading.Thread(target=_worker, daemon=True).start()
+        self._ai_pool.submit(_worker)
 
     def _show_rewrite_result(self, original, rewritten, style):
         """Show the rewritten text with option to replace"""
@@ -1329,8 +1839,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
 
         def replace_text():
             """Replace the original text with rewritten version"""
-            self.txt_content.delete("1.0", tk.END)
-            self.txt_content.insert("1.0", rewritten)
+            self._replace_editor_text(rewritten)
             self.mark_modified()
             modal.destroy()
             messagebox.showinfo("Success", "Text replaced with rewritten version")
@@ -1348,9 +1857,10 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
 
     # ---------------- Reminders Tab ----------------
     def build_reminders_tab(self, parent):
-        # Main container with padding
+        """Build the reminders tab, yielding between sections (see _hydrate_tab)"""
+        # Main container with padding; packed only once every section exists so
+        # the idle passes between sections don't lay out a half-built tab
         main_container = ttk.Frame(parent, padding=15)
-        main_container.pack(fill="both", expand=True)
         
         # Left side - Schedule form
         left_frame = ttk.Frame(main_container)
@@ -1371,6 +1881,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             foreground="gray"
         ).pack(anchor="w", pady=(6, 0))
         
+        yield
         # Date & Time Selection Card
         datetime_card = ttk.Labelframe(left_frame, text="📅 Date & Time", padding=15)
         datetime_card.pack(fill="x", pady=(0, 15))
@@ -1399,7 +1910,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         month_combo = ttk.Combobox(
             date_row,
             textvariable=self.rem_month_var,
-            values=[f"{i:02d} - {['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'][i-1]}" for i in range(1, 13)],
+            values=_MONTH_COMBO_VALUES,
             width=12,
             font=("Segoe UI", 14),
             state="readonly"
@@ -1411,7 +1922,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         day_combo = ttk.Combobox(
             date_row,
             textvariable=self.rem_day_var,
-            values=[f"{i:02d}" for i in range(1, 32)],
+            values=_DAY_COMBO_VALUES,
             width=6,
             font=("Segoe UI", 14),
             state="readonly"
@@ -1429,7 +1940,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         hour_combo = ttk.Combobox(
             time_row,
             textvariable=self.rem_hour_var,
-            values=[f"{i:02d}" for i in range(24)],
+            values=_HOUR_COMBO_VALUES,
             width=6,
             font=("Segoe UI", 14),
             state="readonly"
@@ -1443,7 +1954,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         minute_combo = ttk.Combobox(
             time_row,
             textvariable=self.rem_minute_var,
-            values=[f"{i:02d}" for i in range(0, 60, 5)],  # 5-minute intervals
+            values=_MINUTE_COMBO_VALUES,  # 5-minute intervals
             width=6,
             font=("Segoe UI", 14),
             state="readonly"
@@ -1459,10 +1970,10 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         def set_quick_time(hours_ahead):
             future_time = datetime.now() + timedelta(hours=hours_ahead)
             self.rem_year_var.set(str(future_time.year))
-            self.rem_month_var.set(f"{future_time.month:02d} - {['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'][future_time.month-1]}")
-            self.rem_day_var.set(f"{future_time.day:02d}")
-            self.rem_hour_var.set(f"{future_time.hour:02d}")
-            self.rem_minute_var.set(f"{future_time.minute:02d}")
+            self.rem_month_var.set(_MONTH_COMBO_VALUES[future_time.month - 1])
+            self.rem_day_var.set(_DAY_COMBO_VALUES[future_time.day - 1])
+            self.rem_hour_var.set(_HOUR_COMBO_VALUES[future_time.hour])
+            self.rem_minute_var.set(_TWO_DIGITS[future_time.minute])
         
         quick_buttons = [
             ("1 Hour", 1),
@@ -1488,6 +1999,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
                     width=10
                 ).pack(side="left", padx=2)
         
+        yield
         # Message Card
         message_card = ttk.Labelframe(left_frame, text="💬 Reminder Message", padding=15)
         message_card.pack(fill="x", pady=(0, 15))
@@ -1520,6 +2032,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
                     width=15
                 ).pack(side="left", padx=2)
         
+        yield
         # Repeat Options Card
         repeat_card = ttk.Labelframe(left_frame, text="🔁 Repeat Schedule", padding=15)
         repeat_card.pack(fill="x", pady=(0, 15))
@@ -1545,6 +2058,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
                 style="Toolbutton" if TTKBOOTSTRAP_AVAILABLE else None
             ).pack()
         
+        yield
         # Action Buttons
         action_frame = ttk.Frame(left_frame)
         action_frame.pack(fill="x", pady=(0, 10))
@@ -1591,6 +2105,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
                 width=12
             ).pack(side="left")
         
+        yield
         # Right side - Active Reminders List
         right_frame = ttk.Frame(main_container)
         right_frame.pack(side="right", fill="both", expand=True)
@@ -1631,8 +2146,10 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             borderwidth=2
         )
         self.lb_rem.pack(side="left", fill="both", expand=True)
+        self._rem_jids = []  # job id for each lb_rem row, in display order
         scrollbar.config(command=self.lb_rem.yview)
         
+        yield
         # List action buttons
         list_btns = ttk.Frame(right_frame)
         list_btns.pack(fill="x")
@@ -1665,14 +2182,16 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
                 command=self.clear_all_reminders,
                 width=15
             ).pack(side="left")
+
+        main_container.pack(fill="both", expand=True)
     
     def clear_reminder_form(self):
         """Clear all reminder form fields"""
         now = datetime.now()
         self.rem_year_var.set(str(now.year))
-        self.rem_month_var.set(f"{now.month:02d} - {['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'][now.month-1]}")
-        self.rem_day_var.set(f"{now.day:02d}")
-        self.rem_hour_var.set(f"{now.hour:02d}")
+        self.rem_month_var.set(_MONTH_COMBO_VALUES[now.month - 1])
+        self.rem_day_var.set(_DAY_COMBO_VALUES[now.day - 1])
+        self.rem_hour_var.set(_HOUR_COMBO_VALUES[now.hour])
         self.rem_minute_var.set("00")
         self.rem_msg.delete(0, tk.END)
         self.rem_msg.insert(0, "Time to study! 📚")
@@ -1693,7 +2212,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
     def schedule_reminder(self):
         # Get values from dropdowns
         year = self.rem_year_var.get()
-        month_str = self.rem_month_var.get().split(" - ")[0]  # Extract just the number from "01 - Jan"
+        month_str = self.rem_month_var.get()[:2]  # Just the number from "01 - Jan"
         day = self.rem_day_var.get()
         hour = self.rem_hour_var.get()
         minute = self.rem_minute_var.get()
@@ -1711,12 +2230,13 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             )
             
             # Validate that date is in the future
-            if dt <= datetime.now():
+            now = datetime.now()
+            if dt <= now:
                 messagebox.showerror(
                     "⏰ Invalid Date", 
                     "Reminder time must be in the future!\n\n"
-                    f"Selected: {dt.strftime('%Y-%m-%d %H:%M')}\n"
-                    f"Current: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+                    f"Selected: {_format_minute(dt)}\n"
+                    f"Current: {_format_minute(now)}"
                 )
                 return
         except ValueError as e:
@@ -1730,68 +2250,73 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             messagebox.showerror("Error", f"Failed to create reminder:\n{e}")
             return
 
-        def _sched():
-            try:
-                # Schedule with repeat option
-                if repeat == "once":
-                    jid = reminders.schedule_reminder(dt, msg)
-                    repeat_text = ""
-                else:
-                    # For repeating reminders, we'd need to enhance the reminders module
-                    # For now, schedule the first occurrence
-                    jid = reminders.schedule_reminder(dt, f"{msg} (Repeats: {repeat})")
-                    repeat_text = f" (Repeating {repeat})"
-
-                self.after(
-                    200,
-                    lambda: (
-                        self.clear_reminder_form(),
-                        self.refresh_reminders(),
-                    ),
-                )
-                messagebox.showinfo(
-                    "✅ Scheduled", 
-                    f"Reminder scheduled successfully!\n\n"
-                    f"📅 Time: {dt.strftime('%b %d, %Y %H:%M')}\n"
-                    f"💬 Message: {msg}\n"
-                    f"🔁 Repeat: {repeat.capitalize()}{repeat_text}"
-                )
-            except Exception as e:
-                logger.error(f"Failed to schedule reminder: {e}")
-                messagebox.showerror("❌ Schedule Error", f"Failed to schedule reminder:\n{e}")
+        # Schedule with repeat option
+        if repeat == "once":
+            job_msg = msg
+        else:
+            # For repeating reminders, we'd need to enhance the reminders module
+            # For now, schedule the first occurrence
+            job_msg = f"{msg} (Repeats: {repeat})"
+        self.submit_io_job(
+            reminders.schedule_reminder,
+            dt,
+            job_msg,
+            callback=functools.partial(self._on_reminder_scheduled, dt, msg, repeat),
+        )
 
-        threading.Thread(target=_sched, daemon=True).start()
+    def _on_reminder_scheduled(self, dt, msg, repeat, jid, error):
+        """Report a background schedule_reminder (runs on the Tk thread)"""
+        if error is not None:
+            logger.error(f"Failed to schedule reminder: {error}")
+            messagebox.showerror("❌ Schedule Error", f"Failed to schedule reminder:\n{error}")
+            return
+
+        repeat_text = "" if repeat == "once" else f" (Repeating {repeat})"
+        self.clear_reminder_form()
+        self.refresh_reminders()
+        messagebox.showinfo(
+            "✅ Scheduled", 
+            f"Reminder scheduled successfully!\n\n"
+            f"📅 Time: {_MONTHS[dt.month - 1]} {dt.day:02d}, {dt.year} {dt.hour:02d}:{dt.minute:02d}\n"
+            f"💬 Message: {msg}\n"
+            f"🔁 Repeat: {repeat.capitalize()}{repeat_text}"
+        )
 
     def refresh_reminders(self):
+        if self.lb_rem is None:
+            return  # reminders tab not opened yet
         self.lb_rem.delete(0, tk.END)
+        self._rem_jids = []
         try:
             jobs = reminders.list_jobs()
             
             # Update count badge
-            if hasattr(self, 'reminder_count_label'):
+            if self.reminder_count_label is not None:
                 self.reminder_count_label.config(text=str(len(jobs)))
             
             if not jobs:
-                self.lb_rem.insert(tk.END, "")
-                self.lb_rem.insert(tk.END, "   📭 No active reminders")
-                self.lb_rem.insert(tk.END, "")
-                self.lb_rem.insert(tk.END, "   Create your first reminder using the form on the left!")
+                self.lb_rem.insert(
+                    tk.END,
+                    "",
+                    "   📭 No active reminders",
+                    "",
+                    "   Create your first reminder using the form on the left!",
+                )
             else:
-                for i, (jid, nxt) in enumerate(jobs, 1):
-                    # Format: "1. 📅 Message - Next: Dec 2, 2025 14:30"
-                    try:
-                        # Parse and format the datetime nicely
-                        next_time = datetime.fromisoformat(nxt) if isinstance(nxt, str) else nxt
-                        formatted_time = next_time.strftime("%b %d, %Y %H:%M")
-                    except:
-                        formatted_time = str(nxt)
-                    
-                    display_text = f"{i}. 📅 {jid} - Next: {formatted_time}"
-                    self.lb_rem.insert(tk.END, display_text)
+                # Format: "1. 📅 Message - Next: Dec 2, 2025 14:30"
+                # (next-run times repeat across refreshes, so formatting is cached)
+                self.lb_rem.insert(
+                    tk.END,
+                    *(
+                        f"{i}. 📅 {jid} - Next: {_format_next_run(nxt)}"
+                        for i, (jid, nxt) in enumerate(jobs, 1)
+                    ),
+                )
+                self._rem_jids = [jid for jid, _ in jobs]
         except Exception as e:
             logger.error(f"Failed to refresh reminders: {e}")
             self.lb_rem.insert(tk.END, f"❌ Error loading reminders: {e}")
-            if hasattr(self, 'reminder_count_label'):
+            if self.reminder_count_label is not None:
                 self.reminder_count_label.config(text="0")
 
     def cancel_selected_reminder(self):
@@ -1799,8 +2324,10 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         if not sel:
             messagebox.showwarning("Select", "Select a reminder first")
             return
-        text = self.lb_rem.get(sel[0])
-        jid = text.split(" - ")[0]
+        idx = sel[0]
+        if idx >= len(self._rem_jids):
+            return  # placeholder row selected
+        jid = self._rem_jids[idx]
         ok = reminders.remove_job(jid)
         if ok:
             messagebox.showinfo("Cancelled", f"{jid} removed")
@@ -1826,8 +2353,8 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         # Get the selected note
         note = self.filtered_notes[idx]
         
-        snippet = note.get("text", "")[:140].replace("\n", " ")
-        pre_message = f"{note.get('title', '(no-title)')} - {snippet}"
+        snippet = note.text[:140].replace("\n", " ")
+        pre_message = f"{note.title or '(no-title)'} - {snippet}"
         dt_txt = simpledialog.askstring(
             "Reminder time", "Enter reminder time (YYYY-MM-DD HH:MM)"
         )
@@ -1839,12 +2366,20 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             messagebox.showerror("Invalid", f"Invalid datetime: {e}")
             return
 
-        def _sched_note():
-            jid = reminders.schedule_reminder(dt, pre_message)
-            self.after(200, self.refresh_reminders)
-            messagebox.showinfo("Scheduled", f"Reminder set for note (job id: {jid})")
+        self.submit_io_job(
+            reminders.schedule_reminder,
+            dt,
+            pre_message,
+            callback=self._on_note_reminder_scheduled,
+        )
 
-        threading.Thread(target=_sched_note, daemon=True).start()
+    def _on_note_reminder_scheduled(self, jid, error):
+        """Report a background note reminder (runs on the Tk thread)"""
+        if error is not None:
+            messagebox.showerror("❌ Schedule Error", f"Failed to schedule reminder:\n{error}")
+            return
+        self.refresh_reminders()
+        messagebox.showinfo("Scheduled", f"Reminder set for note (job id: {jid})")
 
     # ---------------- Quiz Tab ----------------
     def build_quiz_tab(self, parent):
@@ -1860,12 +2395,13 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
 
         top = ttk.Frame(header_frame)
         top.pack(fill="x", pady=(0, 5))
-        ttk.Button(
+        self.btn_gen_quiz = ttk.Button(
             top,
             text="✨ Generate 5 Questions",
             command=self.generate_quiz,
             bootstyle="primary",
-        ).pack(side="left", padx=4)
+        )
+        self.btn_gen_quiz.pack(side="left", padx=4)
         self.btn_take_quiz = ttk.Button(
             top, text="📝 Take Quiz", command=self.take_quiz, bootstyle="success", state="disabled"
         )
@@ -1889,69 +2425,102 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         )
         self.txt_quiz.pack(fill="both", expand=True, pady=(0, 4))
 
+    def _job_worker(self, jobs, kind):
+        """Run queued jobs off the Tk thread"""
+        while True:
+            fn, args, callback = jobs.get()
+            try:
+                result, error = fn(*args), None
+            except Exception as e:
+                logger.error(f"{kind} job failed: {e}")
+                result, error = None, e
+            delivered = self._safe_after(callback, result, error)
+            jobs.task_done()
+            if not delivered:
+                return  # window already destroyed
+
+    def submit_ai_job(self, fn, *args, callback):
+        """Run fn(*args) on the AI pool; callback(result, error) runs on Tk"""
+        future = self._ai_pool.submit(fn, *args)
+        future.add_done_callback(functools.partial(self._deliver_ai_result, callback))
+
+    def _deliver_ai_result(self, callback, future):
+        """Hand a finished AI future's outcome to callback on the Tk thread"""
+        error = future.exception()
+        if error is not None:
+            logger.error(f"AI job failed: {error}")
+        result = None if error is not None else future.result()
+        self._safe_after(callback, result, error)
+
+    def _safe_after(self, fn, *args):
+        """Schedule fn(*args) on the Tk thread from a worker; False once closed"""
+        if self._closed:
+            return False
+        try:
+            self.after(0, fn, *args)
+            return True
+        except (RuntimeError, tk.TclError):
+            return False  # window destroyed between the check and the call
+
+    def submit_io_job(self, fn, *args, callback):
+        """Queue fn(*args) for the storage worker; callback(result, error) runs on Tk"""
+        self._io_jobs.put((fn, args, callback))
+
+    def _drain_io_jobs(self):
+        """Wait for queued storage jobs on the Tk thread and run their callbacks
+
+        Never Queue.join() here: the worker hands each result over with
+        after(), which waits for the main loop, so join() would deadlock.
+        """
+        while self._io_jobs.unfinished_tasks:
+            self.update()
+            time.sleep(0.01)
+        self.update()  # callbacks scheduled by the last job
+
     def generate_quiz(self):
         # Clear previous quiz and disable take button
         self.current_quiz = None
         self.btn_take_quiz.config(state="disabled")
+        self.btn_gen_quiz.config(state="disabled")
         self.txt_quiz.delete("1.0", tk.END)
         self.txt_quiz.insert(tk.END, "⏳ Generating intelligent quiz questions using AI...\nPlease wait...")
         
-        # Show loading cursor
-        self.config(cursor="wait")
-        self.update()
+        # Reading the notes and the Gemini call both happen in the background
+        logger.info("Generating quiz using Gemini AI")
+        self.submit_ai_job(_quiz_from_notes, callback=self._show_quiz)
+
+    def _show_quiz(self, qs, error=None):
+        """Display generated quiz questions (runs on the Tk thread)"""
+        self.btn_gen_quiz.config(state="normal")
+        self.txt_quiz.delete("1.0", tk.END)
+
+        if error:
+            self.txt_quiz.insert(tk.END, f"❌ Error generating quiz:\n{str(error)}\n\nPlease try again.")
+            return
+
+        if isinstance(qs, str):
+            # No usable notes - qs is the message to show
+            self.txt_quiz.insert(tk.END, qs)
+            return
+
+        self.current_quiz = qs
         
-        try:
-            # Collect text from all notes to give AI comprehensive context
-            all_notes_text = ""
-            notes = storage.list_notes(limit=50)  # Get recent notes for context
-            
-            if not notes:
-                self.txt_quiz.delete("1.0", tk.END)
-                self.txt_quiz.insert(tk.END, "❌ No notes found.\n\nPlease create some notes first before generating quiz questions.")
-                return
-            
-            # Combine note content
-            for note in notes:
-                title = note.get("title", "").strip()
-                text = note.get("text", "").strip()
-                if text:
-                    all_notes_text += f"\n\n=== {title} ===\n{text}"
-            
-            if not all_notes_text.strip():
-                self.txt_quiz.delete("1.0", tk.END)
-                self.txt_quiz.insert(tk.END, "❌ Notes are empty.\n\nPlease add content to your notes before generating quiz questions.")
-                return
-            
-            # Use AI to generate intelligent questions
-            logger.info("Generating quiz using Gemini AI")
-            qs = ai_utils.generate_quiz_questions(all_notes_text, num_questions=5)
-            
-            self.current_quiz = qs
-            self.txt_quiz.delete("1.0", tk.END)
-            
-            if not qs:
-                self.txt_quiz.insert(tk.END, "❌ Could not generate questions.\n\nPossible reasons:\n• Gemini API not configured\n• Notes content too short\n• API rate limit reached\n\nTry adding more detailed notes.")
-                return
-            
-            # Enable take quiz button
-            self.btn_take_quiz.config(state="normal")
-            
-            # Display questions with better formatting
-            self.txt_quiz.insert(tk.END, "🎯 AI-Generated Quiz Questions\n")
-            self.txt_quiz.insert(tk.END, "=" * 50 + "\n\n")
-            
-            for i, q in enumerate(qs, start=1):
-                text = f"Question {i}:\n{q['question']}\n\n✓ Answer: {q['answer']}\n\n" + "-" * 50 + "\n\n"
-                self.txt_quiz.insert(tk.END, text)
-                
-            logger.info(f"Successfully displayed {len(qs)} AI-generated questions")
-        except Exception as e:
-            logger.error(f"Error generating quiz: {e}")
-            self.txt_quiz.delete("1.0", tk.END)
-            self.txt_quiz.insert(tk.END, f"❌ Error generating quiz:\n{str(e)}\n\nPlease try again.")
-        finally:
-            # Restore cursor
-            self.config(cursor="")
+        if not qs:
+            self.txt_quiz.insert(tk.END, "❌ Could not generate questions.\n\nPossible reasons:\n• Gemini API not configured\n• Notes content too short\n• API rate limit reached\n\nTry adding more detailed notes.")
+            return
+        
+        # Enable take quiz button
+        self.btn_take_quiz.config(state="normal")
+        
+        # Display questions with better formatting (one insert for the whole body)
+        sep = "-" * 50
+        body = "🎯 AI-Generated Quiz Questions\n" + "=" * 50 + "\n\n" + "".join(
+            f"Question {i}:\n{q['question']}\n\n✓ Answer: {q['answer']}\n\n{sep}\n\n"
+            for i, q in enumerate(qs, start=1)
+        )
+        self.txt_quiz.insert(tk.END, body)
+
+        logger.info(f"Successfully displayed {len(qs)} AI-generated questions")
 
     def take_quiz(self):
         qs = getattr(self, "current_quiz", None)
@@ -2073,48 +2642,38 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
     def start_timer(self, minutes):
         # stop existing timer if running
         self.stop_timer()
-        self.current_timer_seconds = minutes * 60
-        self.timer_stop_event = threading.Event()
-        self.timer_thread = threading.Thread(
-            target=self._timer_thread_fn, args=(self.timer_stop_event,), daemon=True
-        )
-        self.timer_thread.start()
+        self._timer_minutes = minutes
+        self._timer_end = time.monotonic() + minutes * 60
+        self._timer_running = True
+        self._tick()
         # record history
         now = datetime.now().strftime("%Y-%m-%d %H:%M")
         self.timer_history.insert(0, f"{now} - {minutes} min")
 
-    def _timer_thread_fn(self, stop_event):
-        # Runs in background thread, updates UI via after()
-        while self.current_timer_seconds > 0 and not stop_event.is_set():
-            mins = self.current_timer_seconds // 60
-            secs = self.current_timer_seconds % 60
-            # schedule UI update on main thread
-            self.after(
-                0, lambda m=mins, s=secs: self.timer_label.config(text=f"{m:02}:{s:02}")
-            )
-            time.sleep(1)
-            self.current_timer_seconds -= 1
-
-        if stop_event.is_set():
-            # stopped by user
-            self.after(0, lambda: self.timer_label.config(text="Timer stopped"))
+    def _tick(self):
+        """Update the countdown once a second from the Tk main loop"""
+        self._next_tick = None
+        remaining = max(0, round(self._timer_end - time.monotonic()))
+        if remaining > 0:
+            mins, secs = divmod(remaining, 60)
+            self.timer_label.config(text=f"{mins:02}:{_TWO_DIGITS[secs]}")
+            self._next_tick = self.after(1000, self._tick)
             return
 
         # timer finished -> send notification using reminders.notify for consistency
-        try:
-            reminders.notify(
-                f"Study timer finished ({(time.time() - 0) // 60:.0f} minutes). Great job!"
-            )
-        except Exception:
-            # fallback to osascript via subprocess inside reminders module normally
-            pass
-        self.after(0, lambda: self.timer_label.config(text="Study time finished!"))
+        self._timer_running = False
+        self.timer_label.config(text="Study time finished!")
+        msg = f"Study timer finished ({self._timer_minutes} minutes). Great job!"
+        # notify() speaks the message, so keep it off the Tk thread
+        threading.Thread(target=reminders.notify, args=(msg,), daemon=True).start()
 
     def stop_timer(self):
-        if self.timer_stop_event:
-            self.timer_stop_event.set()
-            self.timer_stop_event = None
-        self.current_timer_seconds = 0
+        if self._next_tick:
+            self.after_cancel(self._next_tick)
+            self._next_tick = None
+        if self._timer_running:
+            self._timer_running = False
+            self.timer_label.config(text="Timer stopped")
 
     # ---------------- Dashboard ----------------
     def build_dashboard_tab(self, parent):
@@ -2198,6 +2757,8 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             right_frame, height=12, font=("Segoe UI", 15), relief="flat", borderwidth=0
         )
         self.lb_upcoming.pack(fill="both", expand=True, pady=(0, 4))
+        self._activity_rows = None  # rows currently shown in lb_activity
+        self._upcoming_rows = None  # rows currently shown in lb_upcoming
 
         # Status bar at bottom
         status_fr = ttk.Frame(parent)
@@ -2211,9 +2772,10 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             side="left", padx=14
         )
 
-    def refresh_dashboard(self):
+    def refresh_dashboard(self, records=None):
         """Populate dashboard cards and lists using storage + reminders.
         Keep this method fast and resilient (catch exceptions from modules).
+        records: recent notes already read from storage (read here if None)
         """
         # Update cards from stats
         try:
@@ -2228,7 +2790,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
 
         # Update header stats
         try:
-            if hasattr(self, "header_stats"):
+            if self.header_stats is not None:
                 self.header_stats.config(
                     text=f"⭐ {total_xp} XP  •  📝 {notes_created} Notes"
                 )
@@ -2237,54 +2799,50 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
 
         # update card labels (use string formatting for thousands)
         try:
-            self._card_total_xp_label.config(text=f"{total_xp}")
-            self._card_notes_label.config(text=f"{notes_created}")
+            _set_label_text(self._card_total_xp_label, f"{total_xp}")
+            _set_label_text(self._card_notes_label, f"{notes_created}")
             if badges:
                 # show count + short preview of first 2 badges
                 preview = ", ".join(badges[:2]) + (",..." if len(badges) > 2 else "")
-                self._card_badges_label.config(text=f"{len(badges)} ({preview})")
+                _set_label_text(self._card_badges_label, f"{len(badges)} ({preview})")
             else:
-                self._card_badges_label.config(text="—")
+                _set_label_text(self._card_badges_label, "—")
         except Exception:
             # widgets not present yet or other UI error; ignore silently
             pass
 
         # Recent activity: prefer recent notes, then recent timers (if any)
-        self.lb_activity.delete(0, tk.END)
         try:
-            recent_notes = storage.list_notes(limit=8)
-            for n in recent_notes:
+            rows = []
+            if records is None:
+                records = storage.list_notes(limit=8)
+            for n in records[:8]:
                 title = n.get("title") or "(untitled)"
-                ts = n.get("datetime", "")
-                # short timestamp if ISO-like
-                short_ts = ts
-                try:
-                    from datetime import datetime
-
-                    short_ts = datetime.fromisoformat(ts).strftime("%b %d %H:%M")
-                except Exception:
-                    short_ts = ts[:16]
-                self.lb_activity.insert(tk.END, f"Note: {title}  — {short_ts}")
+                ts = str(n.get("datetime", ""))
+                short_ts = _format_short_ts(ts)
+                rows.append(f"Note: {title}  — {short_ts}")
         except Exception as e:
-            self.lb_activity.insert(tk.END, f"Could not load recent notes: {e}")
+            rows = [f"Could not load recent notes: {e}"]
+        self._activity_rows = _set_listbox_rows(
+            self.lb_activity, tuple(rows), self._activity_rows
+        )
 
         # Upcoming reminders
-        self.lb_upcoming.delete(0, tk.END)
         try:
             jobs = reminders.list_jobs()
             if not jobs:
-                self.lb_upcoming.insert(tk.END, "No upcoming reminders")
+                rows = ("No upcoming reminders",)
             else:
-                for jid, nxt in jobs[:6]:
-                    self.lb_upcoming.insert(tk.END, f"{jid} — next: {nxt}")
+                rows = tuple(f"{jid} — next: {nxt}" for jid, nxt in jobs[:6])
         except Exception as e:
-            self.lb_upcoming.insert(tk.END, f"Error loading reminders: {e}")
+            rows = (f"Error loading reminders: {e}",)
+        self._upcoming_rows = _set_listbox_rows(
+            self.lb_upcoming, rows, self._upcoming_rows
+        )
 
         # update last-updated label
-        from datetime import datetime as dt_class
-
         self.lbl_last_updated.config(
-            text=f"Last updated: {dt_class.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            text=f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         )
 
     def on_closing(self):
@@ -2292,20 +2850,24 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         logger.info("Application closing - running cleanup...")
         
         try:
+            # Let queued note writes finish and apply their results
+            self._drain_io_jobs()
+
             # Save any unsaved changes
             if self.is_modified:
                 logger.info("Saving modified note before closing")
                 self.save_note_silent()
+                self._drain_io_jobs()
             
             # Stop autosave timer
             if self.autosave_timer:
                 logger.info("Cancelling autosave timer")
                 self.after_cancel(self.autosave_timer)
             
-            # Stop any running timer thread
-            if self.timer_stop_event:
-                logger.info("Stopping timer thread")
-                self.timer_stop_event.set()
+            # Stop the study timer
+            if self._timer_running:
+                logger.info("Stopping study timer")
+                self.stop_timer()
             
             # Stop reminder scheduler
             try:
@@ -2319,34 +2881,64 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             logger.error(f"Error during cleanup: {e}")
         
         # Close the window
+        self._closed = True
         self.destroy()
 
     # ---------------- Keyboard Shortcuts & Autosave ----------------
     def setup_keyboard_shortcuts(self):
         """Setup keyboard shortcuts for common actions"""
+        sc = config.SHORTCUTS
+        bind = self.bind
         try:
-            self.bind(config.SHORTCUTS["save"], lambda e: self.save_note())
-            self.bind(config.SHORTCUTS["new"], lambda e: self.new_note())
-            self.bind(config.SHORTCUTS["quit"], lambda e: self.quit())
-            self.bind(config.SHORTCUTS["refresh"], lambda e: self.refresh_dashboard())
-            self.bind(config.SHORTCUTS["undo"], lambda e: self.undo_note())
-            self.bind(config.SHORTCUTS["redo"], lambda e: self.redo_note())
-            self.bind(config.SHORTCUTS["theme_toggle"], lambda e: self.toggle_theme())
+            bind(sc["save"], _ignore_event(self.save_note))
+            bind(sc["new"], _ignore_event(self.new_note))
+            bind(sc["quit"], _ignore_event(self.quit))
+            bind(sc["refresh"], _ignore_event(self.refresh_dashboard))
+            bind(sc["undo"], _ignore_event(self.undo_note))
+            bind(sc["redo"], _ignore_event(self.redo_note))
+            # The editor's own undo bindings would fire too - run ours once
+            self.txt_content.bind(sc["undo"], _ignore_event(self.undo_note, "break"))
+            self.txt_content.bind(sc["redo"], _ignore_event(self.redo_note, "break"))
+            bind(sc["theme_toggle"], _ignore_event(self.toggle_theme))
             logger.info("Keyboard shortcuts configured (including undo/redo/theme)")
         except Exception as e:
             logger.error(f"Failed to setup keyboard shortcuts: {e}")
 
-    def start_autosave_timer(self):
-        """Start the autosave timer (saves every 3 seconds if modified)"""
-        if self.is_modified and hasattr(self, "txt_content"):
-            self.save_note_silent()
-        # Schedule next check
-        self.autosave_timer = self.after(
-            config.AUTOSAVE_INTERVAL, self.start_autosave_timer
+    def _editor_hash(self):
+        """Signature of the editor: title, tags and the text's (length, hash)"""
+        return (
+            self.entry_title.get().strip(),
+            self.entry_tags.get().strip(),
+            self.txt_content.signature(),
         )
 
+    def _schedule_autosave(self):
+        """Restart the countdown; autosave runs once typing pauses"""
+        if self.autosave_timer:
+            self.after_cancel(self.autosave_timer)
+        self.autosave_timer = self.after(config.AUTOSAVE_DELAY, self._autosave_if_dirty)
+
+    def _autosave_if_dirty(self):
+        """Autosave unless the editor still matches what was last saved"""
+        self.autosave_timer = None
+        if not self.is_modified or self.txt_content is None:
+            return
+        if self._editor_hash() == self._last_saved_hash:
+            # Edits were undone or the note was just loaded - nothing to write
+            self.is_modified = False
+            self.autosave_indicator.show_saved()
+            return
+        self.save_note_silent()
+
+    def start_autosave_timer(self):
+        """Enable autosave (debounced - see mark_modified)"""
+        self.autosave_enabled = True
+        if self.is_modified:
+            self._schedule_autosave()
+
     def stop_autosave_timer(self):
-        """Stop the autosave timer"""
+        """Disable autosave and cancel any pending save"""
+        self.autosave_enabled = False
         if self.autosave_timer:
             self.after_cancel(self.autosave_timer)
             self.autosave_timer = None
@@ -2372,9 +2964,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
                 messagebox.showinfo("Theme", "☀️ Light mode enabled")
             
             # Refresh all UI elements to apply new theme properly
-            self.refresh_notes()
-            self.refresh_reminders()
-            self.refresh_dashboard()
+            self.refresh_all()
             
         except Exception as e:
             logger.error(f"Theme toggle failed: {e}")
@@ -2384,11 +2974,7 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
     def export_note_to_pdf(self):
         """Export current note to PDF"""
         try:
-            from reportlab.lib.pagesizes import letter
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-            from reportlab.lib.enums import TA_LEFT
+            import reportlab  # noqa: F401 - used by _write_pdf on the worker
         except ImportError:
             messagebox.showerror(
                 "Missing Library",
@@ -2397,24 +2983,19 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
             return
 
         title = self.entry_title.get().strip() or "Untitled Note"
-        content = self.txt_content.get("1.0", tk.END).strip()
+        content = self.txt_content.contents().strip()
 
         if not content:
             messagebox.showwarning("Empty Note", "No content to export")
             return
 
         # Sanitize filename - remove invalid characters
-        import re
-        safe_title = re.sub(r'[<>:"/\\|?*]', '_', title)
+        safe_title = _FILENAME_BAD_RE.sub("_", title)
         safe_title = safe_title[:100]  # Limit length
 
         # Ask for save location
         from tkinter import filedialog
 
-        # Show loading cursor
-        self.config(cursor="wait")
-        self.update()
-
         filename = filedialog.asksaveasfilename(
             defaultextension=".pdf",
             filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")],
@@ -2424,75 +3005,38 @@ class App(ttk.Window if TTKBOOTSTRAP_AVAILABLE else tk.Tk):
         if not filename:
             return
 
-        try:
-            # Create PDF
-            doc = SimpleDocTemplate(filename, pagesize=letter)
-            story = []
-            styles = getSampleStyleSheet()
-
-            # Title
-            title_style = ParagraphStyle(
-                "CustomTitle",
-                parent=styles["Heading1"],
-                fontSize=24,
-                textColor="#2c3e50",
-                spaceAfter=30,
-            )
-            story.append(Paragraph(title, title_style))
-            story.append(Spacer(1, 0.2 * inch))
-
-            # Content
-            content_style = ParagraphStyle(
-                "CustomBody",
-                parent=styles["BodyText"],
-                fontSize=12,
-                leading=16,
-                alignment=TA_LEFT,
-            )
-
-            # Split content into paragraphs
-            for para in content.split("\n\n"):
-                if para.strip():
-                    story.append(Paragraph(para.replace("\n", "<br/>"), content_style))
-                    story.append(Spacer(1, 0.15 * inch))
+        # Show loading cursor while the PDF is built in the background
+        self.config(cursor="wait")
+        self.submit_io_job(
+            _write_pdf, filename, title, content, callback=self._on_pdf_exported
+        )
 
-            doc.build(story)
-            logger.info(f"PDF exported: {filename}")
-            messagebox.showinfo("Success", f"Note exported to:\n{filename}")
-        except Exception as e:
-            logger.error(f"PDF export failed: {e}")
-            messagebox.showerror("Export Error", f"Failed to export PDF:\n{e}")
-        finally:
-            # Restore normal cursor
-            self.config(cursor="")
+    def _on_pdf_exported(self, filename, error):
+        """Report a finished PDF export (runs on the Tk thread)"""
+        # Restore normal cursor
+        self.config(cursor="")
+        if error is not None:
+            logger.error(f"PDF export failed: {error}")
+            messagebox.showerror("Export Error", f"Failed to export PDF:\n{error}")
+            return
+        logger.info(f"PDF exported: {filename}")
+        messagebox.showinfo("Success", f"Note exported to:\n{filename}")
 
 
-# Simple summarizer (frequency-based, fallback if NLTK not available)
+# Simple summarizer (frequency-based, no AI needed)
 def simple_summarize(text, num_sent=3):
-    try:
-        from nltk.tokenize import sent_tokenize, word_tokenize
-        from nltk.corpus import stopwords
-
-        sents = sent_tokenize(text)
-        words = word_tokenize(text.lower())
-        stop = set(stopwords.words("english"))
-        freq = {}
-        for w in words:
-            if w.isalpha() and w not in stop:
-                freq[w] = freq.get(w, 0) + 1
-        ranking = {}
-        for i, s in enumerate(sents):
-            score = sum(freq.get(w.lower(), 0) for w in s.split())
-            ranking[i] = score
-        ranked = sorted(ranking.items(), key=lambda x: x[1], reverse=True)
-        selected = [sents[i] for i, _ in ranked[:num_sent]]
-        return " ".join(selected)
-    except Exception:
-        # fallback naive summarizer
-        pts = text.split(".")
-        return ".".join(pts[: min(len(pts), num_sent)]) + (
-            "." if len(pts) > num_sent else ""
-        )
+    sents = [m.group(0).strip() for m in quizgen.SENT_RE.finditer(text)]
+    sents = [s for s in sents if s]
+    freq = Counter(
+        w for w in quizgen.WORD_RE.findall(text.lower()) if w not in quizgen.STOPWORDS
+    )
+    ranking = {}
+    for i, s in enumerate(sents):
+        score = sum(freq[w] for w in quizgen.WORD_RE.findall(s.lower()))
+        ranking[i] = score
+    ranked = heapq.nlargest(num_sent, ranking.items(), key=lambda x: x[1])
+    selected = [sents[i] for i, _ in ranked]
+    return " ".join(selected)
 
 
 if __name__ == "__main__":
@@ -7,55 +7,50 @@ Public API:
 - extract_keywords(text, n=3) -> list of keywords
 """
 
+import heapq
 import random
+import re
+from collections import Counter
 
-# try to use nltk when available, but fall back to a safe tokenizer
-try:
-    from nltk.corpus import stopwords
-    from nltk.tokenize import word_tokenize
-    NLTK_AVAILABLE = True
-except Exception:
-    NLTK_AVAILABLE = False
+# Words (letters, with inner apostrophes) and sentences, tokenized with
+# plain regexes rather than NLTK
+WORD_RE = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)*")
+SENT_RE = re.compile(r"[^.!?]+(?:[.!?]+|$)")
+
+# English stopwords (the common function words from NLTK's list)
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are aren't as at be because
+been before being below between both but by can can't cannot could couldn't did
+didn't do does doesn't doing don't down during each few for from further had
+hadn't has hasn't have haven't having he he'd he'll he's her here here's hers
+herself him himself his how how's i i'd i'll i'm i've if in into is isn't it
+it's its itself just let's me more most mustn't my myself no nor not now of off
+on once only or other ought our ours ourselves out over own same shan't she
+she'd she'll she's should shouldn't so some such than that that's the their
+theirs them themselves then there there's these they they'd they'll they're
+they've this those through to too under until up very was wasn't we we'd we'll
+we're we've were weren't what what's when when's where where's which while who
+who's whom why why's will with won't would wouldn't you you'd you'll you're
+you've your yours yourself yourselves also may might must shall upon us
+""".split())
 
-# small fallback tokenizer/stoplist
-FALLBACK_STOP = {
-    "the","and","is","in","it","of","to","a","an","that","this","for","on","with","as","are","was","were"
-}
 
 def _tokenize_words(text):
     """Return list of lowercase alpha words."""
-    if NLTK_AVAILABLE:
-        try:
-            return [w.lower() for w in word_tokenize(text) if w.isalpha()]
-        except Exception:
-            # fallback to simple split
-            pass
-    # simple fallback
-    return [w.lower() for w in text.split() if w.isalpha()]
+    return [w.lower() for w in WORD_RE.findall(text)]
 
 def extract_keywords(text, n=3):
     """
     Return up to `n` keywords from `text` using frequency heuristic.
-    This is intentionally simple and robust if NLTK is not available.
     """
-    words = _tokenize_words(text.lower())
-    if NLTK_AVAILABLE:
-        try:
-            stop = set(stopwords.words("english"))
-        except Exception:
-            stop = FALLBACK_STOP
-    else:
-        stop = FALLBACK_STOP
+    words = _tokenize_words(text)
+    stop = STOPWORDS
 
-    freq = {}
-    for w in words:
-        if w in stop:
-            continue
-        freq[w] = freq.get(w, 0) + 1
+    freq = Counter(w for w in words if w not in stop)
 
-    # sort by frequency then alphabetically for determinism
-    items = sorted(freq.items(), key=lambda x: (-x[1], x[0]))
-    return [k for k, _ in items][:n]
+    # top n by frequency then alphabetically for determinism (no full sort)
+    items = heapq.nsmallest(n, freq.items(), key=lambda x: (-x[1], x[0]))
+    return [k for k, _ in items]
 
 def _make_question_from_text(note_text, keyword):
     """
@@ -64,10 +59,14 @@ def _make_question_from_text(note_text, keyword):
     if not keyword:
         return None
     # replace only the first occurrence (case-insensitive)
-    import re
-    pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-    question = pattern.sub("_____", note_text, count=1)
-    return question
+    lowered = note_text.lower()
+    if len(lowered) != len(note_text):
+        # lower() changed the length (rare Unicode), so indexes won't line up
+        return re.sub(re.escape(keyword), "_____", note_text, count=1, flags=re.IGNORECASE)
+    start = lowered.find(keyword.lower())
+    if start < 0:
+        return note_text
+    return note_text[:start] + "_____" + note_text[start + len(keyword):]
 
 def generate_quiz(max_q=5):
     """
@@ -85,13 +84,12 @@ def generate_quiz(max_q=5):
     if not notes:
         return []
 
-    random.shuffle(notes)
+    # Only notes long enough to quiz on, and only a few more than needed:
+    # most sampled notes yield a question, so the rest are never tokenized
+    texts = [t for note in notes if len((t := note.get("text", "") or "").strip()) >= 10]
     questions = []
-    for note in notes:
-        text = note.get("text", "") or ""
-        if len(text.strip()) < 10:
-            continue
-        keys = extract_keywords(text, n=2)
+    for text in random.sample(texts, k=min(len(texts), max_q * 4)):
+        keys = extract_keywords(text, n=1)
         if not keys:
             continue
         keyword = keys[0]
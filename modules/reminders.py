@@ -1,21 +1,38 @@
 import subprocess, platform
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from .tts import speak
 
-scheduler = BackgroundScheduler()
+# Reminders are rare and short, so one worker thread is plenty (the default
+# pool allows 10). Missed runs (e.g. while asleep) fire once, up to 60 s late
+scheduler = BackgroundScheduler(
+    executors={"default": ThreadPoolExecutor(1)},
+    job_defaults={"coalesce": True, "misfire_grace_time": 60},
+)
 scheduler.start()
 
+IS_MAC = platform.system()=="Darwin"
+
+# The message is passed as an argument, so quotes in it can't break the script
+_NOTIFY_SCRIPT = [
+    "osascript",
+    "-e", "on run argv",
+    "-e", 'display notification (item 1 of argv) with title "Study Assistant"',
+    "-e", "end run",
+]
+
 def notify(msg):
-    if platform.system()=="Darwin":
+    if IS_MAC:
         try:
-            subprocess.run(["osascript","-e",f'display notification "{msg}" with title "Study Assistant"'])
-        except:
+            # Don't wait for osascript - speak while the banner is shown
+            subprocess.Popen(_NOTIFY_SCRIPT + [msg], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError:
             pass
     speak(msg)
 
 def schedule(run_dt, msg, jid=None):
     jid = jid or str(run_dt.timestamp())
-    scheduler.add_job(lambda:notify(msg), 'date', run_date=run_dt, id=jid)
+    scheduler.add_job(notify, 'date', run_date=run_dt, args=[msg], id=jid)
     return jid
 
 # Alias for backward compatibility
@@ -1,19 +1,33 @@
+import threading
 from . import storage
 try:
     import speech_recognition as sr
 except:
     sr = None
 
+# One recognizer/microphone pair reused across recordings; the lock keeps
+# two workers from opening the microphone at once
+_lock = threading.Lock()
+_recognizer = None
+_mic = None
+
+def _get_devices():
+    global _recognizer, _mic
+    if _recognizer is None:
+        _recognizer = sr.Recognizer()
+        _mic = sr.Microphone()
+    return _recognizer, _mic
+
 def transcribe_from_microphone(timeout=5, phrase_time_limit=20):
     if sr is None:
         return {"error":"speech_recognition missing"}
-    r = sr.Recognizer()
-    mic = sr.Microphone()
-    with mic as source:
-        r.adjust_for_ambient_noise(source, duration=0.8)
-        audio = r.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+    with _lock:
+        r, mic = _get_devices()
+        with mic as source:
+            r.adjust_for_ambient_noise(source, duration=0.8)
+            audio = r.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
     try:
         txt = r.recognize_google(audio)
         return {"text":txt}
     except Exception as e:
-        return {"error":str(e)}
\ No newline at end of file
+        return {"error":str(e)}
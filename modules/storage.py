@@ -1,78 +1,238 @@
-import os, json, pandas as pd
+import os, csv, json, re, sqlite3, threading, functools
+from datetime import datetime
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
-NOTES_CSV = os.path.join(DATA_DIR, "notes.csv")
+NOTES_DB = os.path.join(DATA_DIR, "notes.db")
+NOTES_CSV = os.path.join(DATA_DIR, "notes.csv")  # pre-SQLite store, imported once
 STATS_JSON = os.path.join(DATA_DIR, "stats.json")
 
+FIELDS = ["id", "datetime", "title", "text", "tags", "xp"]
 
-def ensure_files():
-    os.makedirs(DATA_DIR, exist_ok=True)
+# Auto-generated titles for notes saved without one
+UNTITLED_RE = re.compile(r"^Untitled note #(\d+)$")
+
+# Words in a search query (each becomes a prefix term for FTS5)
+_SEARCH_TERM_RE = re.compile(r"\w+")
+
+# Full-text index over notes, kept in sync by triggers
+_FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5("
+    "title, text, tags, content='notes', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN "
+    "INSERT INTO notes_fts (rowid, title, text, tags) "
+    "VALUES (new.id, new.title, new.text, new.tags); END",
+    "CREATE TRIGGER IF NOT EXISTS notes_ad AFTER DELETE ON notes BEGIN "
+    "INSERT INTO notes_fts (notes_fts, rowid, title, text, tags) "
+    "VALUES ('delete', old.id, old.title, old.text, old.tags); END",
+    "CREATE TRIGGER IF NOT EXISTS notes_au AFTER UPDATE ON notes BEGIN "
+    "INSERT INTO notes_fts (notes_fts, rowid, title, text, tags) "
+    "VALUES ('delete', old.id, old.title, old.text, old.tags); "
+    "INSERT INTO notes_fts (rowid, title, text, tags) "
+    "VALUES (new.id, new.title, new.text, new.tags); END",
+    "INSERT INTO notes_fts (notes_fts) VALUES ('rebuild')",
+)
+
+# One connection shared by the Tk thread and the I/O worker
+_lock = threading.Lock()
+_conn = None
+FTS_AVAILABLE = False  # set by _connect once notes_fts exists
+
+# Last list_notes() rows and the limit they were read with; every write
+# clears them, so repeated refreshes don't query and rebuild the dicts
+_recent = None
+_recent_limit = 0
+
+
+def _locked(fn):
+    """Run fn while holding the notes database lock"""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with _lock:
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def _notes_changed():
+    """Forget the cached list_notes() rows (caller holds the lock)"""
+    global _recent
+    _recent = None
+
+
+def _to_int(value, default=0):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _import_csv(conn):
+    """Copy notes from the old NOTES_CSV into a freshly created database"""
     if not os.path.exists(NOTES_CSV):
-        pd.DataFrame(columns=["id", "datetime", "title", "text", "tags", "xp"]).to_csv(
-            NOTES_CSV, index=False
+        return
+    with open(NOTES_CSV, newline="", encoding="utf-8") as f:
+        rows = [
+            (
+                nid,
+                row.get("datetime") or "",
+                row.get("title") or "",
+                row.get("text") or "",
+                row.get("tags") or "",
+                _to_int(row.get("xp")),
+            )
+            for row in csv.DictReader(f)
+            if (nid := _to_int(row.get("id"), None)) is not None
+        ]
+    conn.executemany(
+        "INSERT OR IGNORE INTO notes (id, datetime, title, text, tags, xp) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def _connect():
+    """The shared notes connection, creating the schema on first use"""
+    global _conn, FTS_AVAILABLE
+    if _conn is None:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        conn = sqlite3.connect(NOTES_DB, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS notes ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, datetime TEXT NOT NULL, "
+                "title TEXT NOT NULL DEFAULT '', text TEXT NOT NULL DEFAULT '', "
+                "tags TEXT NOT NULL DEFAULT '', xp INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS notes_datetime ON notes (datetime)"
+            )
+            # user_version records which one-off setup steps are done
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                _import_csv(conn)
+                conn.execute("PRAGMA user_version = 1")
+        if version < 2:
+            try:
+                with conn:
+                    for statement in _FTS_SCHEMA:
+                        conn.execute(statement)
+                    conn.execute("PRAGMA user_version = 2")
+            except sqlite3.OperationalError:
+                pass  # SQLite built without FTS5 - search_notes falls back to LIKE
+        FTS_AVAILABLE = bool(
+            conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'notes_fts'"
+            ).fetchone()
         )
+        _conn = conn
+    return _conn
+
+
+@_locked
+def ensure_files():
+    _connect()
     if not os.path.exists(STATS_JSON):
         with open(STATS_JSON, "w") as f:
             json.dump({"total_xp": 0, "notes_created": 0}, f)
 
 
+@_locked
 def save_note(title, text, tags="", xp=0):
-    ensure_files()
-    df = pd.read_csv(NOTES_CSV)
-    nid = 1 if df.empty else int(df["id"].max()) + 1
-    new = {
-        "id": nid,
-        "datetime": pd.Timestamp.now().isoformat(),
-        "title": title,
-        "text": text,
-        "tags": tags,
-        "xp": xp,
-    }
-    df = pd.concat([df, pd.DataFrame([new])], ignore_index=True)
-    df.to_csv(NOTES_CSV, index=False)
+    conn = _connect()
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO notes (datetime, title, text, tags, xp) VALUES (?, ?, ?, ?, ?)",
+            (datetime.now().isoformat(), title or "", text or "", tags or "", xp or 0),
+        )
+    _notes_changed()
     stats = load_stats()
-    stats["total_xp"] += xp
+    stats["total_xp"] += xp or 0
     stats["notes_created"] += 1
     save_stats(stats)
-    return nid
+    return cur.lastrowid
 
 
+@_locked
 def update_note(note_id, title, text, tags="", xp=0):
     """Update an existing note. Returns True if successful, False if note not found."""
-    ensure_files()
-    df = pd.read_csv(NOTES_CSV)
-    
-    if df.empty or note_id not in df["id"].values:
-        return False
-    
-    # Update the note
-    df.loc[df["id"] == note_id, "title"] = title
-    df.loc[df["id"] == note_id, "text"] = text
-    df.loc[df["id"] == note_id, "tags"] = tags
-    df.loc[df["id"] == note_id, "datetime"] = pd.Timestamp.now().isoformat()
+    conn = _connect()
     # Don't update XP for edits - keeps original XP
-    
-    df.to_csv(NOTES_CSV, index=False)
-    return True
+    with conn:
+        cur = conn.execute(
+            "UPDATE notes SET title = ?, text = ?, tags = ?, datetime = ? WHERE id = ?",
+            (
+                title or "",
+                text or "",
+                tags or "",
+                datetime.now().isoformat(),
+                _to_int(note_id, None),
+            ),
+        )
+    _notes_changed()
+    return cur.rowcount > 0
 
 
+@_locked
 def list_notes(limit=50):
-    ensure_files()
-    df = pd.read_csv(NOTES_CSV)
-    if df.empty:
-        return []
+    """Most recent notes first, as a list of dicts (shared - don't modify them)"""
+    global _recent, _recent_limit
+    # The cache answers any smaller limit, or any limit once it holds every note
+    if _recent is not None and (limit <= _recent_limit or len(_recent) < _recent_limit):
+        return _recent[:limit]
+    rows = _connect().execute(
+        "SELECT id, datetime, title, text, tags, xp FROM notes "
+        "ORDER BY datetime DESC LIMIT ?",
+        (limit,),
+    )
+    _recent = [dict(row) for row in rows]
+    _recent_limit = limit
+    return _recent[:]
+
 
-    # Fix NaN values in tags column
-    if "tags" in df.columns:
-        df["tags"] = df["tags"].fillna("")
+@_locked
+def search_notes(query, limit=50):
+    """Notes matching every word of query (as a prefix), best matches first"""
+    terms = _SEARCH_TERM_RE.findall(query)
+    if not terms:
+        return []
+    conn = _connect()
+    if FTS_AVAILABLE:
+        match = " ".join(f'"{term}"*' for term in terms)
+        rows = conn.execute(
+            "SELECT n.id, n.datetime, n.title, n.text, n.tags, n.xp "
+            "FROM notes_fts JOIN notes AS n ON n.id = notes_fts.rowid "
+            "WHERE notes_fts MATCH ? ORDER BY rank LIMIT ?",
+            (match, limit),
+        )
+    else:
+        like = " AND ".join(
+            "(title LIKE ? ESCAPE '\\' OR text LIKE ? ESCAPE '\\' "
+            "OR tags LIKE ? ESCAPE '\\')"
+            for _ in terms
+        )
+        params = []
+        for term in terms:
+            pattern = "%" + re.sub(r"([\\%_])", r"\\\1", term) + "%"
+            params += [pattern] * 3
+        rows = conn.execute(
+            "SELECT id, datetime, title, text, tags, xp FROM notes "
+            f"WHERE {like} ORDER BY datetime DESC LIMIT ?",
+            (*params, limit),
+        )
+    return [dict(row) for row in rows]
 
-    # Fix NaN values in other string columns
-    for col in ["title", "text"]:
-        if col in df.columns:
-            df[col] = df[col].fillna("")
 
-    df = df.sort_values("datetime", ascending=False).head(limit)
-    return df.to_dict(orient="records")
+@_locked
+def get_max_untitled_index():
+    """Highest N among "Untitled note #N" titles, or 0 if there are none"""
+    rows = _connect().execute(
+        "SELECT title FROM notes WHERE title LIKE 'Untitled note #%'"
+    )
+    nums = (UNTITLED_RE.match(title) for (title,) in rows)
+    return max((int(m.group(1)) for m in nums if m), default=0)
 
 
 def load_stats():
@@ -81,46 +241,31 @@ def load_stats():
 
 
 def save_stats(obj):
-    ensure_files()
+    os.makedirs(DATA_DIR, exist_ok=True)
     with open(STATS_JSON, "w") as f:
         json.dump(obj, f, indent=2)
 
 
+@_locked
 def delete_note(note_id):
     """Delete a note by id (int or string). Returns True if deleted, False otherwise.
     Updates stats.total_xp (subtracts note xp if present) and notes_created.
     """
-    ensure_files()
-    try:
-        import pandas as pd
-    except Exception:
-        # pandas is required for storage operations; if unavailable, fail gracefully
-        return False
-
-    # load existing notes
-    df = pd.read_csv(NOTES_CSV)
-    if df.empty:
-        return False
+    conn = _connect()
 
     # normalize id
-    try:
-        nid = int(note_id)
-    except Exception:
+    nid = _to_int(note_id, None)
+    if nid is None:
         return False
 
-    if nid not in df["id"].values:
-        return False
-
-    # preserve xp value to update stats
-    try:
-        row = df[df["id"] == nid].iloc[0]
-        xp = int(row.get("xp", 0) or 0)
-    except Exception:
-        xp = 0
-
-    # remove the note and save
-    df = df[df["id"] != nid]
-    df.to_csv(NOTES_CSV, index=False)
+    # remove the note, keeping its xp to update stats
+    with conn:
+        row = conn.execute("SELECT xp FROM notes WHERE id = ?", (nid,)).fetchone()
+        if row is None:
+            return False
+        conn.execute("DELETE FROM notes WHERE id = ?", (nid,))
+    _notes_changed()
+    xp = row["xp"] or 0
 
     # update stats
     stats = load_stats()
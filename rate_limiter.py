@@ -0,0 +1,65 @@
+"""
+Rate limiting for Smart Study Assistant
+Keeps Gemini traffic under the per-minute request and token quotas
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+import config
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe limiter with separate request and token buckets
+
+    Both buckets refill continuously at their per-minute rate. acquire()
+    blocks until there is room for one request of the given size, so
+    bursts of UI actions queue up instead of triggering 429 errors.
+    """
+
+    def __init__(self, rpm, tpm):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._last = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last
+        self._last = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60.0)
+
+    def acquire(self, tokens=0):
+        """Block until one request using `tokens` tokens fits the budget"""
+        tokens = min(tokens, self.tpm)
+        with self._cond:
+            waited = False
+            while True:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    break
+                # Time until both buckets have enough capacity
+                need_req = max(0.0, 1 - self._requests) * 60.0 / self.rpm
+                need_tok = max(0.0, tokens - self._tokens) * 60.0 / self.tpm
+                if not waited:
+                    logger.info("Rate limit reached - queueing Gemini request")
+                    waited = True
+                self._cond.wait(max(need_req, need_tok, 0.01))
+
+    @contextmanager
+    def reserve(self, est_tokens=0):
+        """Context manager form of acquire()"""
+        self.acquire(est_tokens)
+        yield
+
+
+bucket = TokenBucket(config.GEMINI_RPM, config.GEMINI_TPM)
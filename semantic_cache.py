@@ -0,0 +1,122 @@
+"""
+Semantic cache for Smart Study Assistant
+Reuses AI responses for inputs whose embeddings are nearly identical
+"""
+
+import json
+import os
+import threading
+
+import config
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+    logger.warning("numpy not installed - semantic cache disabled")
+
+
+class SemanticCache:
+    """Nearest-neighbour lookup over normalized embedding vectors"""
+
+    def __init__(self, path=config.SEMANTIC_CACHE_FILE, max_entries=500):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._matrix = None  # float32 array, shape (N, D)
+        self._entries = []  # list of (namespace, response)
+        self._loaded = False
+
+    @property
+    def available(self):
+        return NUMPY_AVAILABLE
+
+    def _meta_path(self):
+        return os.path.splitext(self.path)[0] + ".json"
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            if os.path.exists(self.path) and os.path.exists(self._meta_path()):
+                matrix = np.load(self.path)
+                with open(self._meta_path(), "r") as f:
+                    entries = [tuple(e) for e in json.load(f)]
+                if len(entries) == matrix.shape[0]:
+                    self._matrix = matrix.astype(np.float32, copy=False)
+                    self._entries = entries
+                    logger.info("Loaded %d semantic cache entries", len(entries))
+        except Exception as e:
+            logger.warning("Could not load semantic cache: %s", e)
+
+    def _save(self):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            np.save(self.path, self._matrix)
+            with open(self._meta_path(), "w") as f:
+                json.dump(self._entries, f)
+        except Exception as e:
+            logger.warning("Could not save semantic cache: %s", e)
+
+    @staticmethod
+    def _normalize(vector):
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def lookup(self, namespace, vector, threshold=config.SEMANTIC_CACHE_THRESHOLD):
+        """Return the closest cached response in namespace if similarity > threshold"""
+        if not NUMPY_AVAILABLE or vector is None:
+            return None
+        with self._lock:
+            self._load()
+            if self._matrix is None or not self._entries:
+                return None
+            q = self._normalize(vector)
+            if q.shape[0] != self._matrix.shape[1]:
+                return None
+            scores = self._matrix @ q
+            mask = np.fromiter(
+                (ns == namespace for ns, _ in self._entries),
+                dtype=bool,
+                count=len(self._entries),
+            )
+            if not mask.any():
+                return None
+            scores[~mask] = -1.0
+            best = int(np.argmax(scores))
+            if scores[best] > threshold:
+                logger.debug("Semantic cache hit (%.3f)", scores[best])
+                return self._entries[best][1]
+        return None
+
+    def add(self, namespace, vector, response):
+        """Insert a new (embedding, response) pair"""
+        if not NUMPY_AVAILABLE or vector is None:
+            return
+        with self._lock:
+            self._load()
+            row = self._normalize(vector)[np.newaxis, :]
+            if self._matrix is None or self._matrix.shape[1] != row.shape[1]:
+                self._matrix = row
+                self._entries = [(namespace, response)]
+            else:
+                self._matrix = np.vstack([self._matrix, row])
+                self._entries.append((namespace, response))
+            # Drop oldest entries once over capacity
+            if len(self._entries) > self.max_entries:
+                self._matrix = self._matrix[-self.max_entries :]
+                self._entries = self._entries[-self.max_entries :]
+            self._save()
+
+
+semantic_cache = SemanticCache()
@@ -3,6 +3,7 @@ Modern UI Components for Smart Study Assistant
 Provides reusable widgets with consistent styling
 """
 
+import hashlib
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 import config
@@ -63,6 +64,7 @@ class SearchBox(ttk.Frame):
         self.placeholder = placeholder
         self.is_placeholder = True  # Set this BEFORE creating StringVar with trace
         self.search_var = tk.StringVar()
+        self._search_after_id = None
 
         # Search icon label
         search_icon = ttk.Label(self, text="🔍", font=config.FONT_BODY)
@@ -97,12 +99,24 @@ class SearchBox(ttk.Frame):
             self.is_placeholder = True
 
     def _on_text_change(self, *args):
+        # Debounce: search once typing pauses for 150 ms
+        if self._search_after_id:
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
         if not self.is_placeholder and self.on_search:
-            self.on_search(self.search_var.get())
+            self._search_after_id = self.after(150, self._run_search)
+
+    def _run_search(self):
+        self._search_after_id = None
+        self.on_search(self.search_var.get())
 
     def clear(self):
         self.entry.delete(0, tk.END)
         self.is_placeholder = False
+        # Searching "" right away supersedes any debounced search
+        if self._search_after_id:
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
         if self.on_search:
             self.on_search("")
 
@@ -110,51 +124,106 @@ class SearchBox(ttk.Frame):
         return "" if self.is_placeholder else self.search_var.get()
 
 
+class TrackedText(scrolledtext.ScrolledText):
+    """ScrolledText that caches its contents between edits
+
+    insert/delete/replace are intercepted at the Tcl level, so the cache is
+    dropped as soon as the text changes rather than on the queued
+    <<Modified>> event. Reads between edits never cross into Tcl.
+    """
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self._contents = None
+        self._signature = None
+        self._orig = self._w + "_orig"
+        self.tk.call("rename", self._w, self._orig)
+        # The proxy is a Tcl proc, so errors from the real widget (bad index,
+        # nothing to undo) reach the caller as a normal TclError; only edits
+        # call back into Python. Late calls after destroy are ignored.
+        body = (
+            "if {[info commands %(orig)s] eq {}} return\n"
+            "if {[lindex $args 0] in {insert delete replace}} %(changed)s\n"
+            "tailcall %(orig)s {*}$args"
+        ) % {"orig": self._orig, "changed": self.register(self._changed)}
+        self.tk.call("proc", self._w, "args", body)
+        # Let tkinter delete the proxy command when the widget is destroyed
+        if self._tclCommands is None:
+            self._tclCommands = []
+        self._tclCommands.append(self._w)
+
+    def _changed(self):
+        """Drop the cached contents (called from Tcl before every edit)"""
+        self._contents = None
+        self._signature = None
+
+    def contents(self):
+        """Full text including Tk's trailing newline (same as get("1.0", "end"))"""
+        if self._contents is None:
+            self._contents = self.get("1.0", "end")
+        return self._contents
+
+    def signature(self):
+        """(length, 64-bit BLAKE2b) of contents(), for cheap change checks"""
+        if self._signature is None:
+            text = self.contents()
+            digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+            self._signature = (len(text), digest)
+        return self._signature
+
+
 class TagWidget(ttk.Frame):
     """Widget for displaying and managing tags"""
 
     def __init__(self, parent, tags=None, on_tag_click=None, **kwargs):
         super().__init__(parent, **kwargs)
         self.on_tag_click = on_tag_click
-        self.tag_labels = []
+        self.tag_labels = []  # labels currently shown
+        self._pool = []  # (frame, label) pairs, reused across set_tags calls
 
         if tags:
             self.set_tags(tags)
 
     def set_tags(self, tags):
         """Display a list of tags"""
-        # Clear existing tags
-        for label in self.tag_labels:
-            label.destroy()
-        self.tag_labels.clear()
-
-        # Create new tag labels
-        for i, tag in enumerate(tags):
-            if not tag.strip():
-                continue
+        colors = config.TAG_COLORS
+        n_colors = len(colors)
+        shown = [(i, tag) for i, tag in enumerate(tags) if tag.strip()]
 
+        # Create labels only when the pool is too small; reconfigure the rest
+        while len(self._pool) < len(shown):
             tag_frame = ttk.Frame(self)
-            tag_frame.pack(side="left", padx=2, pady=2)
-
-            color_idx = i % len(config.TAG_COLORS)
-
             tag_label = tk.Label(
                 tag_frame,
-                text=f" {tag} ",
                 font=config.FONT_SMALL,
-                bg=config.TAG_COLORS[color_idx],
                 fg="white",
                 cursor="hand2",
                 padx=8,
                 pady=3,
             )
             tag_label.pack()
-
+            tag_label.tag = ""
             if self.on_tag_click:
-                tag_label.bind("<Button-1>", lambda e, t=tag: self.on_tag_click(t))
+                tag_label.bind(
+                    "<Button-1>", lambda e, l=tag_label: self.on_tag_click(l.tag)
+                )
+            self._pool.append((tag_frame, tag_label))
 
+        self.tag_labels = []
+        for (tag_frame, tag_label), (i, tag) in zip(self._pool, shown):
+            text = f" {tag} "
+            bg = colors[i % n_colors]
+            if tag_label.tag != tag or tag_label.cget("bg") != bg:
+                tag_label.config(text=text, bg=bg)
+                tag_label.tag = tag
+            if not tag_frame.winfo_manager():  # hidden last time
+                tag_frame.pack(side="left", padx=2, pady=2)
             self.tag_labels.append(tag_label)
 
+        # Hide pooled labels that aren't needed this time
+        for tag_frame, _ in self._pool[len(shown):]:
+            tag_frame.pack_forget()
+
 
 class Modal(tk.Toplevel):
     """A modal dialog with consistent styling"""
@@ -162,18 +231,16 @@ class Modal(tk.Toplevel):
     def __init__(self, parent, title="", width=500, height=400, **kwargs):
         super().__init__(parent, **kwargs)
         self.title(title)
-        self.geometry(f"{width}x{height}")
 
-        # Center on parent
+        # Size and center on parent in one geometry call (the parent is
+        # already mapped, so no layout flush is needed to measure it)
+        x = parent.winfo_rootx() + (parent.winfo_width() - width) // 2
+        y = parent.winfo_rooty() + (parent.winfo_height() - height) // 2
+        self.geometry(f"{width}x{height}+{x}+{y}")
+
         self.transient(parent)
         self.grab_set()
 
-        # Center the window
-        self.update_idletasks()
-        x = parent.winfo_x() + (parent.winfo_width() // 2) - (width // 2)
-        y = parent.winfo_y() + (parent.winfo_height() // 2) - (height // 2)
-        self.geometry(f"+{x}+{y}")
-
         # Main container (also aliased as content for convenience)
         self.container = ttk.Frame(self, padding=config.PADDING_LARGE)
         self.container.pack(fill="both", expand=True)
@@ -216,34 +283,39 @@ class Modal(tk.Toplevel):
 
 
 class LoadingSpinner(ttk.Frame):
-    """A simple loading indicator"""
+    """A simple loading indicator (create once, then start()/stop() it)
+
+    The animation is an indeterminate progress bar, which Tk drives itself,
+    so no Python callback runs while it spins.
+    """
 
     def __init__(self, parent, text="Loading...", **kwargs):
         super().__init__(parent, **kwargs)
         self.is_running = False
+        self.text = text
 
         self.label = ttk.Label(self, text=text, font=config.FONT_BODY)
         self.label.pack()
 
-        self.spinner_chars = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
-        self.current_char = 0
+        self.bar = ttk.Progressbar(self, mode="indeterminate", length=120)
+        self.bar.pack(pady=(4, 0))
+
+    def set_text(self, text):
+        """Change the message shown above the spinner"""
+        self.text = text
+        self.label.config(text=text)
 
     def start(self):
         """Start the spinning animation"""
+        if self.is_running:
+            return
         self.is_running = True
-        self._animate()
+        self.bar.start(80)
 
     def stop(self):
         """Stop the spinning animation"""
         self.is_running = False
-
-    def _animate(self):
-        if self.is_running:
-            self.label.config(
-                text=f"{self.spinner_chars[self.current_char]} Loading..."
-            )
-            self.current_char = (self.current_char + 1) % len(self.spinner_chars)
-            self.after(100, self._animate)
+        self.bar.stop()
 
 
 class AutosaveIndicator(ttk.Frame):
@@ -312,6 +384,22 @@ class SummaryModal(Modal):
             ]
         )
 
+    def append_text(self, text):
+        """Append text to the summary (used while a response streams in)"""
+        self.summary_text += text
+        self.text_area.config(state="normal")
+        self.text_area.insert("end", text)
+        self.text_area.see("end")
+        self.text_area.config(state="disabled")
+
+    def set_text(self, text):
+        """Replace the summary text"""
+        self.summary_text = text
+        self.text_area.config(state="normal")
+        self.text_area.delete("1.0", "end")
+        self.text_area.insert("1.0", text)
+        self.text_area.config(state="disabled")
+
     def _copy_to_clipboard(self):
         """Copy summary to clipboard"""
         text = self.text_area.get("1.0", "end-1c")
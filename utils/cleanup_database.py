@@ -3,45 +3,89 @@
 Database Cleanup Utility - Remove duplicate notes and fix counts
 """
 
-import pandas as pd
+import hashlib
 import os
+import sqlite3
+
+import sync_stats
+from notes_store import connect_db, data_dir
+
+# The app's SQLite store (data/notes.db under the project root)
+notes_db = os.path.join(data_dir(), "notes.db")
+
+
+def read_notes(conn):
+    """Stream (id, title, text) rows from notes.db, oldest first"""
+    return conn.execute("SELECT id, title, text FROM notes ORDER BY id")
+
+
+def note_key(title, text):
+    """Compact fingerprint of a note's (title, text) for duplicate checks"""
+    data = f"{title or ''}\0{text or ''}".encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def delete_notes(conn, ids=None):
+    """Back up notes.db, then delete the notes in ids (every note if None)
+
+    Returns the number of notes left. The app's triggers keep the search
+    index in step with the deletes.
+    """
+    backup_file = notes_db + ".backup"
+    backup = sqlite3.connect(backup_file)
+    try:
+        conn.backup(backup)
+    finally:
+        backup.close()
+    print(f"✅ Backup created: {backup_file}")
+
+    with conn:
+        if ids is None:
+            conn.execute("DELETE FROM notes")
+        else:
+            conn.executemany("DELETE FROM notes WHERE id = ?", ((nid,) for nid in ids))
+    return conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
 
-# Use relative path from script location
-script_dir = os.path.dirname(os.path.abspath(__file__))
-notes_csv = os.path.join(script_dir, "data", "notes.csv")
 
 print("🧹 Smart Study Assistant - Database Cleanup")
 print("=" * 60)
 print()
 
-if not os.path.exists(notes_csv):
-    print("❌ notes.csv not found!")
+if not os.path.exists(notes_db):
+    print("❌ notes.db not found!")
+    print("   Start the app once - it imports any pre-SQLite notes.csv into notes.db")
     exit(1)
 
-# Load notes
-df = pd.read_csv(notes_csv)
-print(f"📊 Current database: {len(df)} notes")
+conn = connect_db(notes_db, readonly=False)
+
+# One pass: list the notes and find duplicates (keeping the first/oldest)
+print("📄 Current notes in database:")
+seen = set()
+duplicates = []
+total = 0
+for nid, title, text in read_notes(conn):
+    total += 1
+    print(f"   {nid:>2}. {title or 'Untitled'}")
+    key = note_key(title, text)
+    if key in seen:
+        duplicates.append((nid, title))
+    else:
+        seen.add(key)
+print()
+print(f"📊 Current database: {total} notes")
 print()
 
 # Show duplicates
 print("🔍 Checking for duplicates...")
-duplicates = df[df.duplicated(subset=['title', 'text'], keep='first')]
-if not duplicates.empty:
+if duplicates:
     print(f"⚠️  Found {len(duplicates)} duplicate notes:")
-    for idx, row in duplicates.iterrows():
-        print(f"   - ID {row['id']}: '{row['title']}' (duplicate)")
+    for nid, title in duplicates:
+        print(f"   - ID {nid}: '{title}' (duplicate)")
     print()
 else:
     print("✅ No duplicates found")
     print()
 
-# Show all notes
-print("📄 Current notes in database:")
-for idx, row in df.iterrows():
-    title = row['title'] if pd.notna(row['title']) else "Untitled"
-    print(f"   {row['id']:2d}. {title}")
-print()
-
 # Ask user what to do
 print("=" * 60)
 print("Options:")
@@ -51,24 +95,17 @@ print("3. Exit without changes")
 print()
 
 choice = input("Enter choice (1/2/3): ").strip()
+changed = False
 
 if choice == "1":
     print()
     print("🧹 Removing duplicates...")
-    # Keep first occurrence (oldest)
-    df_clean = df.drop_duplicates(subset=['title', 'text'], keep='first')
-    removed = len(df) - len(df_clean)
-    
-    if removed > 0:
-        # Backup original
-        backup_file = notes_csv + ".backup"
-        df.to_csv(backup_file, index=False)
-        print(f"✅ Backup created: {backup_file}")
-        
-        # Save cleaned data
-        df_clean.to_csv(notes_csv, index=False)
-        print(f"✅ Removed {removed} duplicate notes")
-        print(f"✅ Database now has {len(df_clean)} unique notes")
+
+    if duplicates:
+        kept = delete_notes(conn, [nid for nid, _ in duplicates])
+        print(f"✅ Removed {len(duplicates)} duplicate notes")
+        print(f"✅ Database now has {kept} unique notes")
+        changed = True
     else:
         print("✅ No duplicates to remove")
 
@@ -76,15 +113,9 @@ elif choice == "2":
     print()
     confirm = input("⚠️  Are you sure? This will DELETE ALL NOTES! (yes/no): ").strip().lower()
     if confirm == "yes":
-        # Backup original
-        backup_file = notes_csv + ".backup"
-        df.to_csv(backup_file, index=False)
-        print(f"✅ Backup created: {backup_file}")
-        
-        # Create empty dataframe with headers
-        df_empty = pd.DataFrame(columns=['id', 'datetime', 'title', 'text', 'tags', 'xp'])
-        df_empty.to_csv(notes_csv, index=False)
+        delete_notes(conn)
         print("✅ All notes removed - database cleared")
+        changed = True
     else:
         print("❌ Cancelled - no changes made")
 
@@ -92,6 +123,13 @@ else:
     print()
     print("❌ No changes made")
 
+conn.close()
+
+# Bring stats.json in line with the notes that are left
+if changed:
+    print()
+    sync_stats.sync_stats(force=True)
+
 print()
 print("=" * 60)
 print("✅ Done! Restart the app to see changes.")
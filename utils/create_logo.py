@@ -1,38 +1,86 @@
 """
 Create a professional logo for Smart Study Assistant
 """
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+import numpy as np
+import hashlib
+import math
 import os
 
+SIZE = 128
+
+# Color scheme - modern gradient blue/purple
+PRIMARY_COLOR = (66, 133, 244)  # Google blue
+SECONDARY_COLOR = (156, 39, 176)  # Purple
+ACCENT_COLOR = (255, 193, 7)  # Gold for star
+
+RADIUS = 58
+CAP_WIDTH = 50
+
+# Star vertices around (0, 0): alternate outer/inner points every 36
+# degrees, starting at the top
+_STAR_UNIT = tuple(
+    ((8 if i % 2 == 0 else 4) * math.cos(math.radians(i * 36 - 90)),
+     (8 if i % 2 == 0 else 4) * math.sin(math.radians(i * 36 - 90)))
+    for i in range(10)
+)
+
+LOGO_PATH = os.path.join(os.path.dirname(__file__), 'logo.png')
+ICON_PATH = os.path.join(os.path.dirname(__file__), 'icon.png')
+# Hash of the drawing parameters the current PNGs were made with
+HASH_PATH = LOGO_PATH + '.sha'
+
+# zlib level for the PNGs: 1 writes fastest at a slightly larger file;
+# set LOGO_PNG_COMPRESS_LEVEL=9 for the smallest files in release builds
+PNG_SAVE_OPTIONS = {
+    'compress_level': int(os.getenv('LOGO_PNG_COMPRESS_LEVEL', '1')),
+    'optimize': False,
+}
+
+
+def _params_key():
+    params = (SIZE, PRIMARY_COLOR, SECONDARY_COLOR, ACCENT_COLOR, RADIUS, CAP_WIDTH)
+    return hashlib.blake2b(repr(params).encode(), digest_size=16).hexdigest()
+
+
+def _is_current(key):
+    """True if both PNGs exist and were drawn with the parameters in key"""
+    if not (os.path.exists(LOGO_PATH) and os.path.exists(ICON_PATH)):
+        return False
+    try:
+        with open(HASH_PATH) as f:
+            return f.read().strip() == key
+    except OSError:
+        return False
+
+
 def create_logo():
-    # Create a 128x128 image with transparent background
-    size = 128
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Color scheme - modern gradient blue/purple
-    primary_color = (66, 133, 244)  # Google blue
-    secondary_color = (156, 39, 176)  # Purple
-    accent_color = (255, 193, 7)  # Gold for star
+    key = _params_key()
+    if _is_current(key):
+        return LOGO_PATH, ICON_PATH
+
+    size = SIZE
+    primary_color = PRIMARY_COLOR
+    accent_color = ACCENT_COLOR
     
     # Draw circular background with gradient effect
     center = size // 2
-    radius = 58
-    
-    # Outer circle (shadow effect)
-    draw.ellipse([center-radius-2, center-radius-2, 
-                  center+radius+2, center+radius+2], 
-                 fill=(primary_color[0], primary_color[1], primary_color[2], 200))
+    radius = RADIUS
     
-    # Main circle
-    draw.ellipse([center-radius, center-radius, 
-                  center+radius, center+radius], 
-                 fill=primary_color)
+    # Both circles come from one distance grid instead of two ellipse calls
+    yy, xx = np.ogrid[:size, :size]
+    dist_sq = (xx - center) ** 2 + (yy - center) ** 2
+    pixels = np.zeros((size, size, 4), dtype=np.uint8)  # transparent background
+    # Outer circle (shadow effect), then main circle on top
+    pixels[dist_sq <= (radius + 2) ** 2] = (*primary_color, 200)
+    pixels[dist_sq <= radius ** 2] = (*primary_color, 255)
+    img = Image.fromarray(pixels, 'RGBA')
+    draw = ImageDraw.Draw(img)
     
     # Draw graduation cap
     # Cap top (square board)
     cap_top_y = center - 15
-    cap_width = 50
+    cap_width = CAP_WIDTH
     cap_points = [
         (center - cap_width//2, cap_top_y),
         (center + cap_width//2, cap_top_y),
@@ -58,38 +106,32 @@ def create_logo():
     # Book cover
     draw.rectangle([center-25, book_y, center+25, book_y+20], 
                    fill='white', outline=None)
-    # Book pages (side lines)
-    for i in range(3):
-        x_offset = -20 + i * 2
-        draw.line([center+x_offset, book_y+3, center+x_offset, book_y+17], 
-                  fill=primary_color, width=1)
+    # Book pages (side lines): every other column of a white strip, pasted
+    # onto the cover in one go
+    pages = np.full((15, 5, 4), 255, dtype=np.uint8)
+    pages[:, ::2, :3] = primary_color
+    img.paste(Image.fromarray(pages, 'RGBA'), (center-20, book_y+3))
     
     # Add a small star for "smart" element
     star_y = center - 35
-    star_points = []
-    for i in range(10):
-        angle = i * 36  # 360/10
-        if i % 2 == 0:
-            r = 8
-        else:
-            r = 4
-        import math
-        x = center + r * math.cos(math.radians(angle - 90))
-        y = star_y + r * math.sin(math.radians(angle - 90))
-        star_points.append((x, y))
+    star_points = [(center + dx, star_y + dy) for dx, dy in _STAR_UNIT]
     draw.polygon(star_points, fill=accent_color)
     
     # Save the logo
-    logo_path = os.path.join(os.path.dirname(__file__), 'logo.png')
-    img.save(logo_path, 'PNG')
+    logo_path = LOGO_PATH
+    img.save(logo_path, 'PNG', **PNG_SAVE_OPTIONS)
     print(f"✅ Logo created successfully: {logo_path}")
     
     # Also create a smaller version for window icon
-    icon_img = img.resize((64, 64), Image.Resampling.LANCZOS)
-    icon_path = os.path.join(os.path.dirname(__file__), 'icon.png')
-    icon_img.save(icon_path, 'PNG')
+    # reducing_gap lets Pillow box-reduce first when SIZE is 4x+ the icon
+    icon_img = img.resize((64, 64), Image.Resampling.LANCZOS, reducing_gap=2.0)
+    icon_path = ICON_PATH
+    icon_img.save(icon_path, 'PNG', **PNG_SAVE_OPTIONS)
     print(f"✅ Icon created successfully: {icon_path}")
     
+    with open(HASH_PATH, 'w') as f:
+        f.write(key)
+    
     return logo_path, icon_path
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+"""
+Notes Store - Shared notes reader for the utility scripts
+Reads data/notes.db (the app's store) when it exists, else the pre-SQLite
+notes.csv. The count, XP total and first/last few notes are reused until
+the underlying files change
+"""
+
+import csv
+import functools
+import os
+import sqlite3
+from collections import deque, namedtuple
+from operator import itemgetter
+from pathlib import Path
+
+
+@functools.cache
+def find_root(start=Path(__file__).resolve().parent):
+    """Nearest directory at or above start that contains main.py"""
+    for p in (start, *start.parents):
+        if (p / "main.py").exists():
+            return p
+    return None
+
+
+def data_dir():
+    """The app's data directory (<project root>/data)"""
+    root = find_root()
+    return os.path.join(root if root is not None else os.getcwd(), "data")
+
+
+def connect_db(path, readonly=True):
+    """sqlite3 connection to notes.db (read-only unless asked otherwise)"""
+    if readonly:
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    return sqlite3.connect(path)
+
+
+def _file_key(path):
+    """(mtime, size) of path, or None if it doesn't exist"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# head/tail hold (id, title, xp) tuples for the first and last notes
+NotesSummary = namedtuple("NotesSummary", "count total_xp head tail")
+
+
+class NotesStore:
+    """Summary of the notes in one data directory, re-read only on change"""
+
+    def __init__(self, data_dir, head=3, tail=10):
+        self.db_path = os.path.join(data_dir, "notes.db")
+        self.csv_path = os.path.join(data_dir, "notes.csv")
+        self.head = head
+        self.tail = tail
+        self._key = None
+        self._summary = None
+
+    @property
+    def uses_db(self):
+        """True once the app has created notes.db (notes.csv is then stale)"""
+        return os.path.exists(self.db_path)
+
+    @property
+    def source(self):
+        """File name the notes are read from"""
+        return os.path.basename(self.db_path if self.uses_db else self.csv_path)
+
+    def summary(self):
+        """NotesSummary for the notes (raises OSError/sqlite3.Error on failure)"""
+        if self.uses_db:
+            # Recent writes may still sit in the WAL file
+            key = ("db", _file_key(self.db_path), _file_key(self.db_path + "-wal"))
+            read = self._read_db
+        else:
+            st = os.stat(self.csv_path)
+            key = ("csv", st.st_mtime_ns, st.st_size)
+            read = self._read_csv
+        if key != self._key:
+            self._summary = read()
+            self._key = key
+        return self._summary
+
+    def _read_db(self):
+        conn = connect_db(self.db_path)
+        try:
+            count, total_xp = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(xp), 0) FROM notes"
+            ).fetchone()
+            # Only the columns the scripts print
+            head = conn.execute(
+                "SELECT id, title, xp FROM notes ORDER BY id LIMIT ?", (self.head,)
+            ).fetchall()
+            tail = conn.execute(
+                "SELECT id, title, xp FROM notes ORDER BY id DESC LIMIT ?", (self.tail,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return NotesSummary(count, int(total_xp), head, tail[::-1])
+
+    def _read_csv(self):
+        # Only the id, title and xp cells are used - plain csv.reader rows
+        # skip building a dict of every column per note
+        count = 0
+        total_xp = 0
+        head = []
+        tail = deque(maxlen=self.tail)
+        with open(self.csv_path, newline="", encoding="utf-8", buffering=1 << 16) as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or ["id", "title", "xp"]  # empty file
+            pick = itemgetter(header.index("id"), header.index("title"), header.index("xp"))
+            for row in reader:
+                if not row:
+                    continue  # blank line, skipped like DictReader does
+                try:
+                    nid, title, xp = pick(row)
+                except IndexError:  # short row - treat missing cells as empty
+                    nid, title, xp = pick(row + [""] * len(header))
+                try:
+                    xp = int(float(xp or 0))
+                except ValueError:
+                    xp = 0
+                count += 1
+                total_xp += xp
+                note = (nid, title, xp)
+                if len(head) < self.head:
+                    head.append(note)
+                tail.append(note)
+        return NotesSummary(count, total_xp, head, list(tail))
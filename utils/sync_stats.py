@@ -1,65 +1,145 @@
 #!/usr/bin/env python3
 """
-Sync Stats - Recalculate stats.json from actual notes.csv data
+Sync Stats - Recalculate stats.json from the stored notes
+(data/notes.db, or notes.csv from before the SQLite move)
 Use this when stats get out of sync with the database
 """
 
-import pandas as pd
+import argparse
 import json
 import os
+import sqlite3
+import sys
 
-# Paths
-DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
-NOTES_CSV = os.path.join(DATA_DIR, "notes.csv")
+from notes_store import NotesStore, data_dir
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # fall back to the stdlib json module
+
+# Paths - the app's data directory, found from the project root
+DATA_DIR = data_dir()
 STATS_JSON = os.path.join(DATA_DIR, "stats.json")
 
+NOTES = NotesStore(DATA_DIR)
+NOTES_CSV = NOTES.csv_path
 
-def sync_stats():
-    """Recalculate stats from notes.csv and update stats.json"""
-    
-    print("🔄 Syncing stats from database...")
-    print()
-    
-    # Load current notes
+
+def _load_stats():
+    """Current stats.json contents, or None if missing/unreadable"""
+    try:
+        with open(STATS_JSON, "rb") as f:
+            data = f.read()
+        return orjson.loads(data) if orjson else json.loads(data)
+    except Exception:
+        return None
+
+
+def _write_stats(stats):
+    """Write stats.json atomically (temp file + fsync + rename)"""
+    if orjson:
+        data = orjson.dumps(stats, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(stats, indent=2).encode("utf-8")
+    tmp = STATS_JSON + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, STATS_JSON)
+
+
+def sync_stats(force=False):
+    """Recalculate stats from the notes and update stats.json
+
+    Counts come from notes.db with a few small queries when it exists.
+    Otherwise notes.csv is streamed; stats.json remembers the mtime/size it
+    was synced from, and if the file is unchanged and the totals still match,
+    nothing is re-read (unless force is set).
+
+    The report is collected and written to stdout in one go at the end.
+    """
+    out = []
     try:
-        df = pd.read_csv(NOTES_CSV)
+        _sync(force, out)
+    finally:
+        sys.stdout.write("\n".join(out) + "\n")
+
+
+def _sync(force, out):
+    out.append("🔄 Syncing stats from database...")
+    out.append("")
+
+    old_stats = _load_stats()
+    if NOTES.uses_db:
+        try:
+            notes_count, total_xp, _, recent = NOTES.summary()
+        except sqlite3.Error as e:
+            out.append(f"❌ Error reading notes.db: {e}")
+            return
+        recent = [(nid, title or "(untitled)", xp) for nid, title, xp in recent]
+        _save_synced(out, old_stats, notes_count, total_xp, recent, synced_from=None)
+        return
+
+    try:
+        csv_stat = os.stat(NOTES_CSV)
+    except OSError:
+        out.append("❌ Error reading notes.csv: file not found")
+        return
+
+    synced = (old_stats or {}).get("synced_from")
+    if (
+        not force
+        and synced
+        and synced.get("mtime_ns") == csv_stat.st_mtime_ns
+        and synced.get("size") == csv_stat.st_size
+        and synced.get("notes_created") == old_stats.get("notes_created")
+        and synced.get("total_xp") == old_stats.get("total_xp")
+    ):
+        out.append("✅ notes.csv unchanged since the last sync - stats are up to date")
+        out.append(f"   Notes: {old_stats.get('notes_created', 0)}")
+        out.append(f"   XP: {old_stats.get('total_xp', 0)}")
+        out.append("   (use --force to recount)")
+        return
+
+    try:
+        notes_count, total_xp, _, recent = NOTES.summary()
     except Exception as e:
-        print(f"❌ Error reading notes.csv: {e}")
+        out.append(f"❌ Error reading notes.csv: {e}")
         return
-    
-    # Calculate real stats
-    if df.empty:
-        total_xp = 0
-        notes_count = 0
-        print("📊 Database is empty")
+    recent = [(nid, title or "(untitled)", xp) for nid, title, xp in recent]
+
+    # Remember what was counted so an unchanged file can be skipped next time
+    synced_from = {
+        "mtime_ns": csv_stat.st_mtime_ns,
+        "size": csv_stat.st_size,
+        "notes_created": notes_count,
+        "total_xp": total_xp,
+    }
+    _save_synced(out, old_stats, notes_count, total_xp, recent, synced_from)
+
+
+def _save_synced(out, old_stats, notes_count, total_xp, recent, synced_from):
+    """Report the recount and write it to stats.json"""
+    if notes_count == 0:
+        out.append("📊 Database is empty")
     else:
-        # Count notes
-        notes_count = len(df)
-        
-        # Sum XP (handle NaN)
-        if "xp" in df.columns:
-            df["xp"] = df["xp"].fillna(0)
-            total_xp = int(df["xp"].sum())
-        else:
-            total_xp = 0
-        
-        print(f"📊 Found {notes_count} notes in database")
-        print(f"⭐ Total XP: {total_xp}")
+        out.append(f"📊 Found {notes_count} notes in database")
+        out.append(f"⭐ Total XP: {total_xp}")
     
-    print()
+    out.append("")
     
-    # Load current stats file
-    try:
-        with open(STATS_JSON, "r") as f:
-            old_stats = json.load(f)
-        print("📋 Current stats.json:")
-        print(f"   Notes: {old_stats.get('notes_created', 0)}")
-        print(f"   XP: {old_stats.get('total_xp', 0)}")
-    except Exception:
+    # Show current stats file
+    if old_stats is not None:
+        out.append("📋 Current stats.json:")
+        out.append(f"   Notes: {old_stats.get('notes_created', 0)}")
+        out.append(f"   XP: {old_stats.get('total_xp', 0)}")
+    else:
         old_stats = {}
-        print("📋 No stats.json found")
+        out.append("📋 No stats.json found")
     
-    print()
+    out.append("")
     
     # Create new stats
     new_stats = {
@@ -70,29 +150,32 @@ def sync_stats():
     # Preserve badges if they exist
     if "badges" in old_stats:
         new_stats["badges"] = old_stats["badges"]
+
+    if synced_from:
+        new_stats["synced_from"] = synced_from
     
     # Save updated stats
     try:
-        with open(STATS_JSON, "w") as f:
-            json.dump(new_stats, f, indent=2)
-        print("✅ Stats synced successfully!")
-        print()
-        print("📋 New stats.json:")
-        print(f"   Notes: {new_stats['notes_created']}")
-        print(f"   XP: {new_stats['total_xp']}")
+        _write_stats(new_stats)
+        out.append("✅ Stats synced successfully!")
+        out.append("")
+        out.append("📋 New stats.json:")
+        out.append(f"   Notes: {new_stats['notes_created']}")
+        out.append(f"   XP: {new_stats['total_xp']}")
     except Exception as e:
-        print(f"❌ Error saving stats: {e}")
+        out.append(f"❌ Error saving stats: {e}")
         return
     
     # Show note details if any exist
-    if not df.empty and notes_count <= 10:
-        print()
-        print("📝 Current notes:")
-        for idx, row in df.iterrows():
-            title = row.get("title", "(untitled)")[:30]
-            xp = row.get("xp", 0)
-            print(f"   [{row['id']}] {title} ({xp} XP)")
+    if notes_count and notes_count <= 10:
+        out.append("")
+        out.append("📝 Current notes:")
+        out.extend(f"   [{nid}] {title[:30]} ({xp} XP)" for nid, title, xp in recent)
 
 
 if __name__ == "__main__":
-    sync_stats()
+    parser = argparse.ArgumentParser(description="Recalculate stats.json from the stored notes")
+    parser.add_argument(
+        "--force", action="store_true", help="recount even if notes.csv is unchanged"
+    )
+    sync_stats(force=parser.parse_args().force)
@@ -3,51 +3,79 @@
 Quick verification that the notes section is working properly
 """
 
-print("🧪 Notes Section Verification")
-print("=" * 60)
-print()
-
-# Check that the app file exists
 import os
-app_path = "/Users/ashviksinha/Library/CloudStorage/OneDrive-BENNETTUNIVERSITY/python/vsscode/newproject/main.py"
-if os.path.exists(app_path):
-    print("✅ main.py exists")
-else:
-    print("❌ main.py not found")
-    exit(1)
-
-# Check that notes data exists
-data_path = "/Users/ashviksinha/Library/CloudStorage/OneDrive-BENNETTUNIVERSITY/python/vsscode/newproject/data/notes.csv"
-if os.path.exists(data_path):
-    print("✅ notes.csv exists")
-    
-    import pandas as pd
-    df = pd.read_csv(data_path)
-    print(f"✅ Found {len(df)} notes in database")
-    
-    # Show sample notes
-    if not df.empty:
-        print("\nSample notes:")
-        for idx, row in df.head(3).iterrows():
-            print(f"  - ID: {row['id']}, Title: {row['title']}")
-else:
-    print("⚠️  notes.csv not found (will be created on first run)")
-
-print()
-print("=" * 60)
-print("🎯 MANUAL TESTING CHECKLIST:")
-print("=" * 60)
-print()
-print("1. [ ] App starts without errors")
-print("2. [ ] Notes list shows all notes on left side")
-print("3. [ ] Click a note - it loads in the editor")
-print("4. [ ] Type in search box - notes filter instantly")
-print("5. [ ] Click 'Delete' button - confirmation appears")
-print("6. [ ] Confirm delete - note disappears from list")
-print("7. [ ] Click 'Remind' button - dialog appears")
-print("8. [ ] Click 'Refresh List' - list updates")
-print()
-print("=" * 60)
-print()
-print("✅ If ALL checkboxes pass, the notes section is WORKING!")
-print()
+import sys
+
+from notes_store import NotesStore, find_root
+
+
+CHECKLIST = """
+============================================================
+🎯 MANUAL TESTING CHECKLIST:
+============================================================
+
+1. [ ] App starts without errors
+2. [ ] Notes list shows all notes on left side
+3. [ ] Click a note - it loads in the editor
+4. [ ] Type in search box - notes filter instantly
+5. [ ] Click 'Delete' button - confirmation appears
+6. [ ] Confirm delete - note disappears from list
+7. [ ] Click 'Remind' button - dialog appears
+8. [ ] Click 'Refresh List' - list updates
+
+============================================================
+
+✅ If ALL checkboxes pass, the notes section is WORKING!
+"""
+
+
+def main():
+    """Run the checks; the report is written to stdout in one go at the end"""
+    out = []
+    try:
+        return _verify(out)
+    finally:
+        sys.stdout.write("\n".join(out) + "\n")
+
+
+def _verify(out):
+    root = find_root()
+
+    out.append("🧪 Notes Section Verification")
+    out.append("=" * 60)
+    out.append("")
+
+    # Check that the app file exists
+    if root is not None:
+        out.append("✅ main.py exists")
+    else:
+        out.append("❌ main.py not found")
+        return 1
+
+    # Check that notes data exists (notes.db, or a pre-SQLite notes.csv
+    # that the app imports on its next start)
+    notes = NotesStore(os.path.join(root, "data"))
+    if notes.uses_db or os.path.exists(notes.csv_path):
+        out.append(f"✅ {notes.source} exists")
+        if not notes.uses_db:
+            out.append("   (pre-SQLite notes - imported into notes.db on the next run)")
+
+        summary = notes.summary()
+        out.append(f"✅ Found {summary.count} notes in database")
+
+        # Show sample notes
+        if summary.head:
+            out.append("\nSample notes:")
+            out.extend(
+                f"  - ID: {nid}, Title: {title or '(untitled)'}"
+                for nid, title, _ in summary.head
+            )
+    else:
+        out.append("⚠️  notes.db not found (will be created on first run)")
+
+    out.append(CHECKLIST)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())